@@ -8,7 +8,10 @@ from sheets_manager import SheetsManager
 from multi_session_manager import MultiSessionManager
 # REMOVED: unused imports from old system
 # from robust_parser import normalize_day_name, normalize_time, get_slots_for_day, parse_booking_schedule
-from config import GSHEET_MAIN_ID, GOOGLE_SERVICE_ACCOUNT_JSON, SHOW_BROWSER
+from config import (
+    GSHEET_MAIN_ID, GOOGLE_SERVICE_ACCOUNT_JSON, SHOW_BROWSER,
+    SENDER_EMAIL, GMAIL_APP_PASSWORD, RECIPIENT_KYLE, RECIPIENT_INFO, IT_EMAIL_ADDRESS
+)
 from utils import get_timestamp
 from email_manager import EmailManager
 
@@ -31,9 +34,7 @@ class BookingOrchestrator:
             print(f"{get_timestamp()} === Initializing Simplified Booking System ===")
             
             # Initialize Google Sheets manager
-            if not GSHEET_MAIN_ID or not GOOGLE_SERVICE_ACCOUNT_JSON:
-                raise ValueError("Google Sheets configuration not set")
-            
+            # SheetsManager._connect() validates the sheet ID and credentials itself
             self.sheets_manager = SheetsManager(GSHEET_MAIN_ID, GOOGLE_SERVICE_ACCOUNT_JSON)
             print(f"{get_timestamp()} ✅ Google Sheets manager initialized")
             
@@ -136,21 +137,24 @@ class BookingOrchestrator:
             print(f"{get_timestamp()} ✅ Successful Bookings: {summary['successful_bookings']}")
             print(f"{get_timestamp()} ❌ Failed Bookings: {summary['failed_bookings']}")
             
+            # Build each details section in one pass and print it with a single call
             if summary['successful_bookings'] > 0:
-                print(f"{get_timestamp()} 📋 Successful Details:")
-                for booking in summary['successful_details']:
-                    court_url, date, time = booking
-                    print(f"{get_timestamp()}   - {date} {time}")
+                ts = get_timestamp()
+                print(f"{ts} 📋 Successful Details:\n" + "\n".join(
+                    f"{ts}   - {date} {time}" for _, date, time in summary['successful_details']
+                ))
             
             if summary['failed_bookings'] > 0:
-                print(f"{get_timestamp()} 📋 Failed Details:")
+                ts = get_timestamp()
+                lines = [f"{ts} 📋 Failed Details:"]
                 for booking in summary['failed_details']:
                     try:
                         court_url, date, time = booking
-                        print(f"{get_timestamp()}   - {date} {time}")
+                        lines.append(f"{ts}   - {date} {time}")
                     except Exception as unpack_error:
-                        print(f"{get_timestamp()} ❌ Error unpacking booking: {booking}, error: {unpack_error}")
-                        print(f"{get_timestamp()}   - Failed booking (raw): {booking}")
+                        lines.append(f"{ts} ❌ Error unpacking booking: {booking}, error: {unpack_error}")
+                        lines.append(f"{ts}   - Failed booking (raw): {booking}")
+                print("\n".join(lines))
             
             # Log summary to Google Sheets
             from utils import get_london_datetime
@@ -193,8 +197,6 @@ class BookingOrchestrator:
             print(f"{get_timestamp()}   Booking log entries collected: {len(booking_log_entries)} entries")
             
             # Validate email configuration and create EmailManager
-            from config import SENDER_EMAIL, GMAIL_APP_PASSWORD, RECIPIENT_KYLE, RECIPIENT_INFO, IT_EMAIL_ADDRESS
-            
             if not SENDER_EMAIL:
                 print(f"{get_timestamp()} ❌ SENDER_EMAIL (KYLE_EMAIL_ADDRESS) not configured, cannot send emails")
                 return
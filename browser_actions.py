@@ -4,193 +4,385 @@
 import os
 import pytz
 import asyncio
+import calendar
 import time
-import random
+import functools
+import math
+import weakref
 from datetime import datetime, timedelta
-from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
 from utils import get_timestamp
+from config import PROGRESS_SCREENSHOTS
+
+# London timezone, resolved once at import instead of on every call
+LONDON_TZ = pytz.timezone("Europe/London")
+
+# Directory for all screenshots; created lazily on the first capture
+SCREENSHOT_DIR = "screenshots"
+_screenshot_dir_ready = False
+
+# Translation table used to make screenshot reasons filename-safe
+_SANITIZE = str.maketrans({" ": "_", ":": "", "/": "-"})
+
+# Calendar header weekday names, indexed by calendar.weekday() (Monday == 0)
+_WEEKDAY_NAMES = ("MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN")
+
+@functools.lru_cache(maxsize=32)
+def _calendar_header_date(target_date_str):
+    """Converts 'DD/MM/YYYY' into the calendar header format, e.g. 'MON 22/9' (parsed once per date)."""
+    day, month, year = (int(part) for part in target_date_str.split("/"))
+    return f"{_WEEKDAY_NAMES[calendar.weekday(year, month, day)]} {day}/{month}"
+
+# One lock per page so overlapping screenshot tasks never drive the same page at once
+_screenshot_locks = weakref.WeakKeyDictionary()
+
+@functools.lru_cache(maxsize=32)
+def _slot_filename_suffix(slot_details):
+    """Returns the "court_date_time" filename suffix for a (court_url, date, time) tuple."""
+    court_url, date_str, time_str = slot_details[:3]
+    court_name = court_url.split('/')[-2]
+    return f"{court_name}_{date_str.replace('/', '-')}_{time_str}"
+
+def _write_screenshot_file(filepath, image_bytes):
+    """Writes captured screenshot bytes to disk (run in a worker thread)."""
+    with open(filepath, "wb") as f:
+        f.write(image_bytes)
 
 # --- Updated Screenshot Helper Function ---
-async def take_screenshot(page, reason, slot_details=None, session=None):
+async def take_screenshot(page, reason, slot_details=None, session=None, full_page=False, jpeg=True):
     """
-    Takes a full-page screenshot with a descriptive, timestamped filename
+    Takes a screenshot with a descriptive, timestamped filename
     and saves it to the 'screenshots' directory.
     
+    Viewport-only JPEG captures are the default; full-page PNG captures are
+    opt-in and reserved for error diagnostics.
+    
     Args:
         page: Playwright page object
         reason: Description of why screenshot was taken
         slot_details: Optional slot details for filename
         session: Optional BookingSession to track the screenshot
+        full_page: Capture the whole scrollable page instead of the viewport
+        jpeg: Save viewport captures as JPEG (quality 60) instead of PNG
     
     Returns:
         str: Path to the saved screenshot file, or None if failed
     """
-    screenshot_dir = "screenshots"
-    os.makedirs(screenshot_dir, exist_ok=True)
+    log = session.log_message if session else print
+    global _screenshot_dir_ready
+    if not _screenshot_dir_ready:
+        os.makedirs(SCREENSHOT_DIR, exist_ok=True)
+        _screenshot_dir_ready = True
     
-    london_tz = pytz.timezone("Europe/London")
-    now = datetime.now(london_tz)
+    now = datetime.now(LONDON_TZ)
     timestamp = now.strftime("%y.%m.%d_%H-%M-%S")
     
-    sanitized_reason = reason.replace(" ", "_").replace(":", "").replace("/", "-")
+    sanitized_reason = reason.translate(_SANITIZE)
+    
+    use_jpeg = jpeg and not full_page
+    extension = "jpg" if use_jpeg else "png"
     
     # Add slot details to the filename if they are provided
     if slot_details:
-        court_name = slot_details[0].split('/')[-2]
-        date = slot_details[1].replace('/', '-')
-        time = slot_details[2]
-        filename = f"{timestamp}_{sanitized_reason}_{court_name}_{date}_{time}.png"
+        filename = f"{timestamp}_{sanitized_reason}_{_slot_filename_suffix(tuple(slot_details))}.{extension}"
     else:
-        filename = f"{timestamp}_{sanitized_reason}.png"
+        filename = f"{timestamp}_{sanitized_reason}.{extension}"
 
-    filepath = os.path.join(screenshot_dir, filename)
+    filepath = os.path.join(SCREENSHOT_DIR, filename)
+    
+    # Capture to memory; the file write happens off the event loop below
+    screenshot_kwargs = {"full_page": full_page}
+    if use_jpeg:
+        screenshot_kwargs.update(type="jpeg", quality=60)
+    
+    lock = _screenshot_locks.setdefault(page, asyncio.Lock())
     
     try:
-        await page.screenshot(path=filepath, full_page=True)
-        log_msg = f"{get_timestamp()} 📸 Screenshot saved: {filepath}"
-        
+        async with lock:
+            image_bytes = await page.screenshot(**screenshot_kwargs)
+        await asyncio.to_thread(_write_screenshot_file, filepath, image_bytes)
+        log(f"{get_timestamp()} 📸 Screenshot saved: {filepath}")
         if session:
-            session.log_message(log_msg)
             session.add_screenshot(filepath, reason)
-        else:
-            print(log_msg)
         
         return filepath
         
     except Exception as e:
-        error_msg = f"{get_timestamp()} ❌ Could not save screenshot. Error: {e}"
-        
-        if session:
-            session.log_message(error_msg)
-        else:
-            print(error_msg)
-        
+        log(f"{get_timestamp()} ❌ Could not save screenshot. Error: {e}")
         return None
 
+# Screenshots started with schedule_screenshot(); held here so they are not garbage collected mid-flight
+_background_screenshots = set()
+
+def schedule_screenshot(page, reason, slot_details=None, session=None):
+    """
+    Starts take_screenshot() as a background task instead of awaiting it.
+    
+    Captures on a page are serialized by the per-page lock, so a screenshot awaited
+    later on the same page (e.g. just before a click) still waits for this one.
+    
+    Returns:
+        asyncio.Task: The running screenshot task
+    """
+    task = asyncio.create_task(take_screenshot(page, reason, slot_details, session=session))
+    _background_screenshots.add(task)
+    task.add_done_callback(_background_screenshots.discard)
+    return task
+
+async def drain_screenshots():
+    """Waits for every screenshot started with schedule_screenshot() to finish."""
+    await asyncio.gather(*_background_screenshots, return_exceptions=True)
+
 async def optimized_countdown_logging(seconds_to_wait):
     """
     Optimized countdown logging: every 10 seconds, then every second for last 5 seconds.
+    Sleeps only between log lines, against a monotonic deadline so drift never accumulates.
     """
-    if seconds_to_wait <= 5:
-        # Last 5 seconds: log every second
-        for remaining in range(seconds_to_wait, 0, -1):
-            print(f"{get_timestamp()} ⏰ {remaining} second{'s' if remaining != 1 else ''} remaining...")
-            await asyncio.sleep(1)
-    else:
-        # More than 5 seconds: log every 10 seconds, then every second for last 5
-        initial_countdown = seconds_to_wait - 5
+    end = time.monotonic() + seconds_to_wait
+    
+    while True:
+        remaining = end - time.monotonic()
+        if remaining <= 0:
+            break
         
-        # Log every 10 seconds for the initial countdown
-        for remaining in range(initial_countdown, 5, -10):
-            if remaining > 0:
-                print(f"{get_timestamp()} ⏰ {remaining} seconds remaining...")
-                await asyncio.sleep(10)
+        whole_seconds = math.ceil(remaining)
+        if whole_seconds > 5:
+            # Sleep in bulk down to the final 5-second countdown (at most 10 seconds per log)
+            step = min(10, remaining - 5)
+        else:
+            # Last 5 seconds: log every second, aligned to whole seconds
+            step = remaining - (whole_seconds - 1)
         
-        # Log every second for the last 5 seconds
-        for remaining in range(5, 0, -1):
-            print(f"{get_timestamp()} ⏰ {remaining} second{'s' if remaining != 1 else ''} remaining...")
-            await asyncio.sleep(1)
+        print(f"{get_timestamp()} ⏰ {whole_seconds} second{'s' if whole_seconds != 1 else ''} remaining...")
+        await asyncio.sleep(step)
 
 
+# In-page predicate: true once the first timetable header differs from the snapshot
+_CALENDAR_CHANGED_JS = """
+(previous) => {
+    const header = document.querySelector('h4.timetable-title');
+    return header !== null && header.textContent.trim() !== previous;
+}
+"""
+
+async def _first_calendar_header(page):
+    """Returns the trimmed text of the first timetable header, or None if unavailable."""
+    try:
+        text = await page.locator("h4.timetable-title").first.text_content(timeout=1000)
+        return text.strip() if text else None
+    except Exception:
+        return None
+
+# Event-driven version of the predicate above: a MutationObserver resolves true on the first
+# DOM change that leaves a different header in place, or false once timeoutMs has passed
+_CALENDAR_CHANGE_OBSERVER_JS = """
+([previous, timeoutMs]) => new Promise((resolve) => {
+    const changed = () => {
+        const header = document.querySelector('h4.timetable-title');
+        return header !== null && header.textContent.trim() !== previous;
+    };
+    if (changed()) {
+        resolve(true);
+        return;
+    }
+    const observer = new MutationObserver(() => {
+        if (changed()) {
+            observer.disconnect();
+            clearTimeout(timer);
+            resolve(true);
+        }
+    });
+    const timer = setTimeout(() => {
+        observer.disconnect();
+        resolve(false);
+    }, timeoutMs);
+    observer.observe(document.documentElement, { childList: true, subtree: true, characterData: true });
+})
+"""
+
+async def _wait_for_calendar_change(page, previous_header, timeout=3000):
+    """
+    Waits until the calendar shows a different week than previous_header.
+    
+    Resolves on the DOM mutation itself rather than on a polling interval. If the
+    click triggered a full postback, the observer's document is torn down mid-wait,
+    so the rest of the budget is spent polling the new document instead.
+    
+    Returns:
+        bool: True if the header changed within the timeout
+    """
+    deadline = time.monotonic() + timeout / 1000
+    try:
+        return bool(await page.evaluate(_CALENDAR_CHANGE_OBSERVER_JS, [previous_header, timeout]))
+    except PlaywrightError:
+        pass
+    
+    remaining_ms = max(0, (deadline - time.monotonic()) * 1000)
+    try:
+        await page.wait_for_function(_CALENDAR_CHANGED_JS, arg=previous_header, timeout=remaining_ms)
+        return True
+    except Exception:
+        # Callers re-check the calendar themselves, so a slow update is not fatal
+        return False
+
+# Pages that already have a dialog handler registered
+_dialog_handled_pages = weakref.WeakSet()
+
+async def _accept_dialog(dialog, session=None):
+    """Accepts any pop-up (e.g. form resubmission) so calendar navigation never stalls."""
+    log = session.log_message if session else print
+    log(f"{get_timestamp()} 🔄 Dialog detected and accepted: {dialog.message}")
+    await dialog.accept()
+
+def _install_dialog_handler(page, session=None):
+    """
+    Registers a dialog handler on the page exactly once.
+    
+    The handler stays active for the lifetime of the page and logs through the
+    session, so accepted dialogs show up in the session log and IT email.
+    """
+    if page not in _dialog_handled_pages:
+        async def dialog_handler(dialog):
+            await _accept_dialog(dialog, session)
+        
+        page.on("dialog", dialog_handler)
+        _dialog_handled_pages.add(page)
+
+# The calendar's "Next Week" button
+_NEXT_WEEK_SELECTOR = "#ctl00_PageContent_btnNextWeek"
+
+# One round trip for everything a Next Week iteration needs to know: whether the target
+# week's header is visible (plain string matching in JS instead of a :has-text selector,
+# so no quoting issues), whether Next Week is visible, and the first header's text for
+# the change check after clicking
+_CALENDAR_PROBE_JS = """
+([targetText, nextWeekSelector]) => {
+    const visible = (el) => {
+        if (!el) return false;
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0 && getComputedStyle(el).visibility !== 'hidden';
+    };
+    const normalize = (text) => (text || '').replace(/\\s+/g, ' ').trim();
+    const headers = Array.from(document.querySelectorAll('h4.timetable-title'));
+    const target = targetText.toLowerCase();
+    return {
+        targetVisible: headers.some((h) => visible(h) && normalize(h.textContent).toLowerCase().includes(target)),
+        nextWeekVisible: visible(document.querySelector(nextWeekSelector)),
+        firstHeader: headers.length ? normalize(headers[0].textContent) : null,
+    };
+}
+"""
+
+async def _probe_calendar(page, formatted_date):
+    """
+    Checks the calendar state with a single page.evaluate call.
+    
+    Returns:
+        tuple: (target_visible, next_week_visible, first_header); a page that is
+        mid-navigation reports (False, False, None)
+    """
+    try:
+        state = await page.evaluate(_CALENDAR_PROBE_JS, [formatted_date, _NEXT_WEEK_SELECTOR])
+    except PlaywrightError:
+        return False, False, None
+    return state["targetVisible"], state["nextWeekVisible"], state["firstHeader"]
+
+async def _target_date_visible(page, formatted_date):
+    """Returns True if a visible calendar header shows formatted_date."""
+    target_visible, _, _ = await _probe_calendar(page, formatted_date)
+    return target_visible
+
+async def _is_visible_now(locator):
+    """Single non-polling visibility check; a page mid-navigation counts as not visible."""
+    try:
+        return await locator.is_visible()
+    except PlaywrightError:
+        return False
+
 async def navigate_to_court(page, court_url, session=None):
     """Navigates the browser to the specified court booking page."""
+    log = session.log_message if session else print
     try:
-        log_msg = f"{get_timestamp()} Navigating to court booking page: {court_url.split('/')[-2]}"
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
-        await page.goto(court_url, wait_until="domcontentloaded", timeout=20000)
+        log(f"{get_timestamp()} Navigating to court booking page: {court_url.split('/')[-2]}")
+        # Only the calendar container matters, so return as soon as the response
+        # starts arriving and wait for that element rather than the whole document
+        await page.goto(court_url, wait_until="commit", timeout=20000)
+        _install_dialog_handler(page, session)
         await page.locator("#DateTimeDiv").wait_for(state="visible", timeout=15000)
-        log_msg = f"{get_timestamp()} ✅ Successfully loaded page for: {await page.title()}"
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
+        log(f"{get_timestamp()} ✅ Successfully loaded page for: {await page.title()}")
         
         # Take screenshot after successful navigation
         await take_screenshot(page, "court_navigation_success", session=session)
         return True
     except Exception as e:
-        log_msg = f"{get_timestamp()} ❌ An error occurred during navigation: {e}"
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
-        await take_screenshot(page, "navigation_error", session=session)
+        log(f"{get_timestamp()} ❌ An error occurred during navigation: {e}")
+        await take_screenshot(page, "navigation_error", session=session, full_page=True)
         return False
 
-async def check_london_time_near_midnight():
+def check_london_time_near_midnight():
     """Check if current London time is within 20 minutes of midnight."""
-    import pytz
-    london_tz = pytz.timezone("Europe/London")
-    now = datetime.now(london_tz)
+    now = datetime.now(LONDON_TZ)
     
     print(f"{get_timestamp()} Current London time: {now.strftime('%H:%M:%S')}")
     
-    # Check if we're within 20 minutes of midnight (23:40 to 00:20)
-    if now.hour == 23 and now.minute >= 40:
-        # Between 23:40 and 23:59 - near midnight
-        return True, now
-    elif now.hour == 0 and now.minute <= 20:
-        # Between 00:00 and 00:20 - just past midnight, still in window
-        return True, now
-    else:
-        return False, now
+    # Within 20 minutes of midnight: 23:40-23:59 before it, or 00:00-00:20 just past it
+    near_midnight = (now.hour == 23 and now.minute >= 40) or (now.hour == 0 and now.minute <= 20)
+    return near_midnight, now
 
 async def wait_until_midnight():
     """Wait until exactly 00:00:01 London time with optimized logging."""
-    import pytz
-    import asyncio
-    
     try:
-        london_tz = pytz.timezone("Europe/London")
+        now = datetime.now(LONDON_TZ)
+        
+        # Check if we've reached or passed the target time (00:00:01)
+        if now.hour == 0 and now.minute == 0 and now.second >= 1:
+            # We've reached 00:00:01 or later, exit immediately
+            print(f"{get_timestamp()} ✅ Target time 00:00:01 reached! Current: {now.strftime('%H:%M:%S')}")
+            return True
+        
+        # Calculate target time - if we're before midnight, target is 00:00:01 next day
+        # If we're after midnight but before 00:00:01, target is 00:00:01 same day
+        target_time = now.replace(hour=0, minute=0, second=1, microsecond=0)
+        if not (now.hour == 0 and now.minute == 0):
+            target_time += timedelta(days=1)
+        
+        # Convert the wall-clock target into a monotonic deadline once; the loop below
+        # only does float arithmetic instead of building tz-aware datetimes every pass
+        deadline = time.monotonic() + (target_time - now).total_seconds()
         
         while True:
-            now = datetime.now(london_tz)
-            
-            # Check if we've reached or passed the target time (00:00:01)
-            if now.hour == 0 and now.minute == 0 and now.second >= 1:
-                # We've reached 00:00:01 or later, exit immediately
-                print(f"{get_timestamp()} ✅ Target time 00:00:01 reached! Current: {now.strftime('%H:%M:%S')}")
-                break
-            
-            # Calculate target time - if we're before midnight, target is 00:00:01 next day
-            # If we're after midnight but before 00:00:01, target is 00:00:01 same day
-            if now.hour == 0 and now.minute == 0 and now.second < 1:
-                # We're between 00:00:00 and 00:00:01, target is 00:00:01 today
-                target_time = now.replace(hour=0, minute=0, second=1, microsecond=0)
-            else:
-                # We're before midnight, target is 00:00:01 tomorrow
-                target_time = now.replace(hour=0, minute=0, second=1, microsecond=0) + timedelta(days=1)
-            
-            seconds_to_wait = (target_time - now).total_seconds()
-            
-            # Exit if we're past target (shouldn't happen with logic above, but safety check)
+            seconds_to_wait = deadline - time.monotonic()
             if seconds_to_wait <= 0:
-                print(f"{get_timestamp()} ✅ Target time 00:00:01 reached! Current: {now.strftime('%H:%M:%S')}")
                 break
             
             # Optimized logging based on time remaining
             if seconds_to_wait <= 10:
                 # Last 10 seconds: log every second
                 print(f"{get_timestamp()} ⏰ {int(seconds_to_wait)} second{'s' if int(seconds_to_wait) != 1 else ''} until 00:00:01...")
-                await asyncio.sleep(1)
+                step = 1
             elif seconds_to_wait <= 60:
                 # Last minute: log every 10 seconds
                 print(f"{get_timestamp()} ⏰ {int(seconds_to_wait)} seconds until 00:00:01...")
-                await asyncio.sleep(10)
-            elif seconds_to_wait <= 600:
-                # Between 10-1 minutes: log every minute
-                minutes = int(seconds_to_wait / 60)
-                print(f"{get_timestamp()} ⏰ {minutes} minute{'s' if minutes != 1 else ''} until 00:00:01...")
-                await asyncio.sleep(60)
+                step = 10
             else:
-                # More than 10 minutes: log every minute but sleep for shorter periods
+                # More than a minute: log every minute
                 minutes = int(seconds_to_wait / 60)
-                print(f"{get_timestamp()} ⏰ {minutes} minutes until 00:00:01...")
-                await asyncio.sleep(30)  # Check more frequently to be responsive
-                
+                print(f"{get_timestamp()} ⏰ {minutes} minute{'s' if minutes != 1 else ''} until 00:00:01...")
+                step = 60
+            
+            # Never sleep past the deadline
+            await asyncio.sleep(min(step, seconds_to_wait))
+        
+        # The monotonic clock can drift from the wall clock (e.g. an NTP slew), so
+        # re-check London time once and sleep off any residual before declaring midnight
+        now = datetime.now(LONDON_TZ)
+        residual = (target_time - now).total_seconds()
+        if residual > 0:
+            print(f"{get_timestamp()} ⏰ Clock skew detected, waiting a further {residual:.2f}s...")
+            await asyncio.sleep(residual)
+            now = datetime.now(LONDON_TZ)
+        
+        print(f"{get_timestamp()} ✅ Target time 00:00:01 reached! Current: {now.strftime('%H:%M:%S')}")
         return True  # Successfully reached target time
         
     except Exception as e:
@@ -203,356 +395,220 @@ async def post_midnight_calendar_advancement(page, target_date_str, slot_details
     An optimised and more aggressive post-midnight calendar navigation function.
     It clicks through the calendar as fast as possible to find the target date.
     """
-    import pytz
-
-    london_tz = pytz.timezone("Europe/London")
-    start_time = datetime.now(london_tz)
+    log = session.log_message if session else print
     timeout_seconds = 80  # MODIFIED: Reduced timeout to 80 seconds
+    deadline = time.monotonic() + timeout_seconds
 
-    date_obj = datetime.strptime(target_date_str, "%d/%m/%Y")
-    formatted_date = f"{date_obj.strftime('%a').upper()} {date_obj.day}/{date_obj.month}"
-
-    log_msg = f"{get_timestamp()} 🚀 Starting optimised post-midnight advancement for '{formatted_date}'..."
-    if session:
-        session.log_message(log_msg)
-    else:
-        print(log_msg)
+    formatted_date = _calendar_header_date(target_date_str)
 
-    # Set up a dialog handler for any pop-ups
-    async def dialog_handler(dialog):
-        log_msg = f"{get_timestamp()} 🔄 Dialog detected and accepted: {dialog.message}"
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
-        await dialog.accept()
+    log(f"{get_timestamp()} 🚀 Starting optimised post-midnight advancement for '{formatted_date}'...")
 
-    page.on("dialog", dialog_handler)
+    # Build the locator once; each check below re-queries the live page
+    next_week_button = page.locator(_NEXT_WEEK_SELECTOR)
 
     try:
         # Loop for a maximum of the specified timeout
-        while (datetime.now(london_tz) - start_time).total_seconds() < timeout_seconds:
-            # First, check if the date is already visible. This is a quick check.
-            try:
-                if await page.locator(f"h4.timetable-title:has-text('{formatted_date}')").is_visible(timeout=500):
-                    log_msg = f"{get_timestamp()} ✅ Target date '{formatted_date}' found!"
-                    if session:
-                        session.log_message(log_msg)
-                    else:
-                        print(log_msg)
-                    await take_screenshot(page, "date_found_optimised", slot_details, session=session)
-                    return True
-            except:
-                # If the check times out, just continue to the next step
-                pass
+        while time.monotonic() < deadline:
+            # One DOM query answers the target check, the Next Week check and the header snapshot
+            target_visible, next_week_visible, previous_header = await _probe_calendar(page, formatted_date)
+
+            # First, check if the date is already visible. This is a quick, non-waiting check.
+            if target_visible:
+                log(f"{get_timestamp()} ✅ Target date '{formatted_date}' found!")
+                schedule_screenshot(page, "date_found_optimised", slot_details, session=session)
+                return True
 
             # More intelligent logic: Check if the button exists before trying to click it.
-            next_week_button = page.locator("#ctl00_PageContent_btnNextWeek")
-            
-            # Use a short timeout to see if the button is present on the page.
-            if await next_week_button.is_visible(timeout=1000):
+            if next_week_visible:
                 # If the button is visible, attempt to click it.
                 try:
                     await next_week_button.click(timeout=15000)
-                    await asyncio.sleep(random.uniform(0.1, 0.25))
                     await page.wait_for_load_state('domcontentloaded', timeout=15000)
+                    await _wait_for_calendar_change(page, previous_header)
 
                 except Exception as e:
                     # This block now correctly handles failures during the click/load process.
-                    log_msg = f"{get_timestamp()} ⚠️ Click/Load failed: {e}. Attempting hard re-navigation..."
-                    if session:
-                        session.log_message(log_msg)
-                    else:
-                        print(log_msg)
+                    log(f"{get_timestamp()} ⚠️ Click/Load failed: {e}. Attempting hard re-navigation...")
                     
                     # HARD RESET: Re-navigate to recover from a broken page state.
                     try:
                         court_url_to_recover = slot_details[0]
                         await page.goto(court_url_to_recover, wait_until="domcontentloaded", timeout=20000)
                         
-                        log_msg = f"{get_timestamp()} 🔄 Recovery navigation complete. Re-applying 2-week strategic advance..."
-                        if session: session.log_message(log_msg)
+                        log(f"{get_timestamp()} 🔄 Recovery navigation complete. Re-applying 2-week strategic advance...")
                         
                         for i in range(2):
-                             await page.locator("#ctl00_PageContent_btnNextWeek").click(timeout=10000)
+                             await next_week_button.click(timeout=10000)
                              await page.wait_for_load_state('domcontentloaded', timeout=10000)
 
                     except Exception as nav_error:
-                        log_msg = f"{get_timestamp()} ❌ CRITICAL: Hard recovery navigation failed: {nav_error}. Loop continues but likely lost."
-                        if session: session.log_message(log_msg)
+                        log(f"{get_timestamp()} ❌ CRITICAL: Hard recovery navigation failed: {nav_error}. Loop continues but likely lost.")
                         await asyncio.sleep(2)
             else:
                 # If the button is NOT visible, we've reached the end of the calendar.
-                log_msg = f"{get_timestamp()} 🛑 'Next Week' button not found. Performing final check on the last available week."
-                if session:
-                    session.log_message(log_msg)
-                else:
-                    print(log_msg)
+                log(f"{get_timestamp()} 🛑 'Next Week' button not found. Performing final check on the last available week.")
                 
-                # Perform one last, more patient check for the date.
-                try:
-                    if await page.locator(f"h4.timetable-title:has-text('{formatted_date}')").is_visible(timeout=3000):
-                        log_msg = f"{get_timestamp()} ✅ Target date '{formatted_date}' found on the final page!"
-                        if session:
-                            session.log_message(log_msg)
-                        else:
-                            print(log_msg)
-                        await take_screenshot(page, "date_found_on_last_page", slot_details, session=session)
-                        return True
-                except:
-                    # This exception means the date was not found even after the patient check.
-                    pass
+                # Perform one last check for the date.
+                if await _target_date_visible(page, formatted_date):
+                    log(f"{get_timestamp()} ✅ Target date '{formatted_date}' found on the final page!")
+                    schedule_screenshot(page, "date_found_on_last_page", slot_details, session=session)
+                    return True
 
                 # If we are here, the button is gone and the date was not on the final page.
-                log_msg = f"{get_timestamp()} ❌ Target date not found on the final page. Ending search."
-                if session:
-                    session.log_message(log_msg)
-                else:
-                    print(log_msg)
+                log(f"{get_timestamp()} ❌ Target date not found on the final page. Ending search.")
                 break # Exit the while loop cleanly.
 
         # If the loop finishes without finding the date, it has timed out
-        log_msg = f"{get_timestamp()} ⏰ Timeout of {timeout_seconds} seconds reached. Could not find target date."
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
+        log(f"{get_timestamp()} ⏰ Timeout of {timeout_seconds} seconds reached. Could not find target date.")
         await take_screenshot(page, "date_search_timeout", slot_details, session=session)
         return False
 
     except Exception as e:
-        log_msg = f"{get_timestamp()} ❌ A critical error occurred in post_midnight_calendar_advancement: {e}"
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
-        await take_screenshot(page, "post_midnight_critical_error", slot_details, session=session)
+        log(f"{get_timestamp()} ❌ A critical error occurred in post_midnight_calendar_advancement: {e}")
+        await take_screenshot(page, "post_midnight_critical_error", slot_details, session=session, full_page=True)
         return False
-    finally:
-        # Always remove the dialog handler to avoid memory leaks
-        page.remove_listener("dialog", dialog_handler)
+
 async def rapid_advance_to_target_week(page, target_date_str, slot_details, session=None):
     """Rapidly click Next Week until we find the target date or reach the end."""
-    date_obj = datetime.strptime(target_date_str, "%d/%m/%Y")
-    formatted_date = f"{date_obj.strftime('%a').upper()} {date_obj.day}/{date_obj.month}"
+    log = session.log_message if session else print
+    formatted_date = _calendar_header_date(target_date_str)
     
-    log_msg = f"{get_timestamp()} 🚀 Rapidly advancing to find '{formatted_date}'..."
-    if session:
-        session.log_message(log_msg)
-    else:
-        print(log_msg)
+    log(f"{get_timestamp()} 🚀 Rapidly advancing to find '{formatted_date}'...")
+    
+    # Build the locator once and reuse it on every iteration
+    next_week_button = page.locator(_NEXT_WEEK_SELECTOR)
     
     for i in range(20):  # Increased limit for rapid advancement
+        # Read the target header, the Next Week button and the current header in one call
+        target_visible, next_week_visible, previous_header = await _probe_calendar(page, formatted_date)
+        
         # Check if target date is visible
-        try:
-            if await page.locator(f"h4.timetable-title:has-text('{formatted_date}')").is_visible(timeout=500):
-                log_msg = f"{get_timestamp()} ✅ Found target date '{formatted_date}' after rapid advancement!"
-                if session:
-                    session.log_message(log_msg)
-                else:
-                    print(log_msg)
-                await take_screenshot(page, "rapid_advance_success", slot_details, session=session)
-                return True
-        except:
-            pass
+        if target_visible:
+            log(f"{get_timestamp()} ✅ Found target date '{formatted_date}' after rapid advancement!")
+            # Not awaited: book_slot's next screenshot on this page waits for the capture anyway
+            schedule_screenshot(page, "rapid_advance_success", slot_details, session=session)
+            return True
         
         # Try to click Next Week
         try:
-            next_week_button = page.locator("#ctl00_PageContent_btnNextWeek")
-            if await next_week_button.is_visible(timeout=500):
+            if next_week_visible:
                 await next_week_button.click()
                 
-                # Wait for calendar content to update using Playwright's built-in waits
+                # Fast path: once the new week's DOM is in, the target check at the top of
+                # the loop answers directly, so the calendar-change wait below is skipped
                 try:
-                    # Wait for the calendar to actually change by checking for new content
-                    await page.wait_for_function(
-                        """
-                        () => {
-                            const headers = document.querySelectorAll('h4.timetable-title');
-                            return headers.length > 0 && headers[0].textContent.trim() !== '';
-                        }
-                        """,
-                        timeout=2000
-                    )
-                except:
-                    # If the function times out, use a more reliable approach
-                    await page.wait_for_load_state('domcontentloaded', timeout=3000)
-                    
-                    # Additional verification that calendar content loaded
+                    await page.wait_for_load_state('domcontentloaded', timeout=2000)
+                except PlaywrightTimeoutError:
+                    pass
+                if await _target_date_visible(page, formatted_date):
+                    continue
+                
+                # Wait for the calendar to actually change before probing it again
+                if not await _wait_for_calendar_change(page, previous_header, timeout=2000):
+                    # If the header did not change in time, at least make sure calendar content
+                    # is on the page; the selector wait implies the DOM is there
                     try:
-                        await page.wait_for_selector('h4.timetable-title', timeout=2000)
+                        await page.wait_for_selector('h4.timetable-title', timeout=5000)
                     except:
-                        log_msg = f"{get_timestamp()} ⚠️ Calendar content not loading properly, continuing..."
-                        if session:
-                            session.log_message(log_msg)
-                        else:
-                            print(log_msg)
+                        log(f"{get_timestamp()} ⚠️ Calendar content not loading properly, continuing...")
             else:
-                log_msg = f"{get_timestamp()} ❌ No more weeks available"
-                if session:
-                    session.log_message(log_msg)
-                else:
-                    print(log_msg)
+                log(f"{get_timestamp()} ❌ No more weeks available")
                 break
         except Exception as e:
-            log_msg = f"{get_timestamp()} ❌ Cannot advance further: {e}"
-            if session:
-                session.log_message(log_msg)
-            else:
-                print(log_msg)
+            log(f"{get_timestamp()} ❌ Cannot advance further: {e}")
             break
     
     # If not found, try refreshing
-    log_msg = f"{get_timestamp()} Target date not found, refreshing page..."
-    if session:
-        session.log_message(log_msg)
-    else:
-        print(log_msg)
+    log(f"{get_timestamp()} Target date not found, refreshing page...")
     await page.reload()
     try:
-        # Handle potential form resubmission dialog
-        page.on("dialog", lambda dialog: dialog.accept())
+        # Form resubmission dialogs are accepted by the handler installed in navigate_to_court
         await page.wait_for_load_state('domcontentloaded', timeout=10000)
-        log_msg = f"{get_timestamp()} ✅ Page refreshed successfully"
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
+        log(f"{get_timestamp()} ✅ Page refreshed successfully")
     except:
-        log_msg = f"{get_timestamp()} ⚠️ Page refresh had issues, continuing..."
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
+        log(f"{get_timestamp()} ⚠️ Page refresh had issues, continuing...")
     
     # Check again after refresh
-    try:
-        if await page.locator(f"h4.timetable-title:has-text('{formatted_date}')").is_visible(timeout=2000):
-            log_msg = f"{get_timestamp()} ✅ Found target date '{formatted_date}' after refresh!"
-            if session:
-                session.log_message(log_msg)
-            else:
-                print(log_msg)
-            await take_screenshot(page, "rapid_advance_after_refresh", slot_details, session=session)
-            return True
-    except:
-        pass
+    if await _target_date_visible(page, formatted_date):
+        log(f"{get_timestamp()} ✅ Found target date '{formatted_date}' after refresh!")
+        schedule_screenshot(page, "rapid_advance_after_refresh", slot_details, session=session)
+        return True
     
     return False
 
 async def find_date_on_calendar(page, target_date_str, slot_details, is_strategic_timing=False, session=None):
     """Enhanced calendar navigation with midnight release strategy."""
-    date_obj = datetime.strptime(target_date_str, "%d/%m/%Y")
-    formatted_date = f"{date_obj.strftime('%a').upper()} {date_obj.day}/{date_obj.month}"
-    log_msg = f"{get_timestamp()} Searching for week containing '{formatted_date}'..."
-    if session:
-        session.log_message(log_msg)
-    else:
-        print(log_msg)
+    log = session.log_message if session else print
+    formatted_date = _calendar_header_date(target_date_str)
+    log(f"{get_timestamp()} Searching for week containing '{formatted_date}'...")
 
     # Strategic timing approach
     if is_strategic_timing:
-        log_msg = f"{get_timestamp()} 🎯 Using strategic midnight release approach..."
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
+        log(f"{get_timestamp()} 🎯 Using strategic midnight release approach...")
         
         # Step 1: Click Next Week only 2 times (get to week before target)
-        log_msg = f"{get_timestamp()} 📅 Advancing 2 weeks ahead to position before target..."
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
+        log(f"{get_timestamp()} 📅 Advancing 2 weeks ahead to position before target...")
+        
+        # Week-advance screenshots run in the background so they overlap the next click
+        screenshot_tasks = []
+        next_week_button = page.locator(_NEXT_WEEK_SELECTOR)
             
         for i in range(2):
             try:
-                next_week_button = page.locator("#ctl00_PageContent_btnNextWeek")
                 # Increase timeout and use more robust waiting
                 await next_week_button.wait_for(state="visible", timeout=10000)
-                log_msg = f"{get_timestamp()}   - Clicking 'Next Week' ({i+1}/2)..."
-                if session:
-                    session.log_message(log_msg)
-                else:
-                    print(log_msg)
+                log(f"{get_timestamp()}   - Clicking 'Next Week' ({i+1}/2)...")
                 
                 # Click and wait for navigation with longer timeout
+                previous_header = await _first_calendar_header(page)
                 await next_week_button.click()
                 await page.wait_for_load_state('domcontentloaded', timeout=15000)
-                # Give extra time for any JavaScript to update the calendar
-                #await asyncio.sleep(1)
+                # Wait for the JavaScript calendar update rather than a fixed sleep
+                await _wait_for_calendar_change(page, previous_header)
                 
                 # Take screenshot after each week advancement
-                await take_screenshot(page, f"week_advance_{i+1}", slot_details, session=session)
+                screenshot_tasks.append(
+                    schedule_screenshot(page, f"week_advance_{i+1}", slot_details, session=session)
+                )
             except Exception as e:
-                log_msg = f"{get_timestamp()} ⚠️ Issue during strategic advancement: {e}"
-                if session:
-                    session.log_message(log_msg)
-                else:
-                    print(log_msg)
+                log(f"{get_timestamp()} ⚠️ Issue during strategic advancement: {e}")
                 # Continue with other attempts instead of breaking completely
                 continue
         
+        await asyncio.gather(*screenshot_tasks, return_exceptions=True)
+        
         # Initialize success flag
         success = False
         
         try:
             # Step 2: Check if we're near midnight
-            near_midnight, current_time = await check_london_time_near_midnight()
+            near_midnight, current_time = check_london_time_near_midnight()
             
             if near_midnight:
-                log_msg = f"{get_timestamp()} ⏰ Within 10 minutes of midnight - entering wait mode..."
-                if session:
-                    session.log_message(log_msg)
-                else:
-                    print(log_msg)
+                log(f"{get_timestamp()} ⏰ Within 10 minutes of midnight - entering wait mode...")
                 
                 # Wait until midnight with error handling
                 midnight_success = await wait_until_midnight()
                 if midnight_success:
-                    log_msg = f"{get_timestamp()} ✅ Midnight wait completed successfully"
-                    if session:
-                        session.log_message(log_msg)
-                    else:
-                        print(log_msg)
+                    log(f"{get_timestamp()} ✅ Midnight wait completed successfully")
                 else:
-                    log_msg = f"{get_timestamp()} ⚠️ Midnight wait failed or timed out"
-                    if session:
-                        session.log_message(log_msg)
-                    else:
-                        print(log_msg)
+                    log(f"{get_timestamp()} ⚠️ Midnight wait failed or timed out")
                     # Still proceed with post-midnight logic as a fallback
             else:
-                log_msg = f"{get_timestamp()} ✅ Not near midnight, proceeding immediately with rapid advancement..."
-                if session:
-                    session.log_message(log_msg)
-                else:
-                    print(log_msg)
+                log(f"{get_timestamp()} ✅ Not near midnight, proceeding immediately with rapid advancement...")
             
             # Step 3: Post-midnight advancement (after midnight or immediately if not near midnight)
             if near_midnight:
                 # We waited until midnight, now use the advanced post-midnight function
-                log_msg = f"{get_timestamp()} 🚀 Starting post-midnight calendar advancement..."
-                if session:
-                    session.log_message(log_msg)
-                else:
-                    print(log_msg)
+                log(f"{get_timestamp()} 🚀 Starting post-midnight calendar advancement...")
                 success = await post_midnight_calendar_advancement(page, target_date_str, slot_details, session=session)
             else:
                 # Not near midnight, use rapid advancement
-                log_msg = f"{get_timestamp()} 🚀 Starting rapid advancement to find target date..."
-                if session:
-                    session.log_message(log_msg)
-                else:
-                    print(log_msg)
+                log(f"{get_timestamp()} 🚀 Starting rapid advancement to find target date...")
                 success = await rapid_advance_to_target_week(page, target_date_str, slot_details, session=session)
         
         except Exception as e:
-            log_msg = f"{get_timestamp()} ❌ Error in strategic timing logic: {e}"
-            if session:
-                session.log_message(log_msg)
-            else:
-                print(log_msg)
+            log(f"{get_timestamp()} ❌ Error in strategic timing logic: {e}")
             success = False
         
         return success
@@ -560,423 +616,322 @@ async def find_date_on_calendar(page, target_date_str, slot_details, is_strategi
 
 async def book_slot(page, target_date_str, target_time_str, slot_details, session=None):
     """Finds a specific date/time slot by its unique href and clicks it."""
+    log = session.log_message if session else print
     href_time_format = target_time_str[:2]
     slot_locator = page.locator(
         f"a.facility-book[href*='fdDate={target_date_str}'][href*='fdTime={href_time_format}']"
     )
     try:
         await slot_locator.wait_for(state="visible", timeout=3000)
-        log_msg = f"{get_timestamp()} ✅ Slot at {target_time_str} is available. Clicking 'Book'..."
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
+        log(f"{get_timestamp()} ✅ Slot at {target_time_str} is available. Clicking 'Book'...")
         
         # Take screenshot before clicking the slot
         await take_screenshot(page, "slot_before_click", slot_details, session=session)
         
         await slot_locator.click()
-        await page.wait_for_load_state('networkidle')
-        log_msg = f"{get_timestamp()} Slot added to basket."
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
+        await page.wait_for_load_state('domcontentloaded', timeout=10000)
+        # The calendar's Book link disappears once the click has navigated to the basket
+        try:
+            await slot_locator.wait_for(state="detached", timeout=5000)
+        except PlaywrightTimeoutError:
+            log(f"{get_timestamp()} ⚠️ Book link still present after click, continuing...")
+        log(f"{get_timestamp()} Slot added to basket.")
         
         # Take screenshot after adding to basket
         await take_screenshot(page, "slot_added_to_basket", slot_details, session=session)
         
         # Navigate back to calendar for next slot booking
         try:
-            log_msg = f"{get_timestamp()} 🔙 Navigating back to calendar using browser back navigation..."
-            if session:
-                session.log_message(log_msg)
-            else:
-                print(log_msg)
+            log(f"{get_timestamp()} 🔙 Navigating back to calendar using browser back navigation...")
             
-            # Use browser back navigation directly (no back button on page)
-            await page.go_back()
-            await page.wait_for_load_state('domcontentloaded', timeout=10000)
+            # Use browser back navigation directly (no back button on page); go_back() would
+            # otherwise wait for the full load event, but the calendar wait below is enough
+            await page.go_back(wait_until="commit", timeout=10000)
             
-            # Give extra time for calendar to reload
-            await asyncio.sleep(2)
+            # Wait for the calendar itself to reappear instead of sleeping a fixed 2 seconds;
+            # this doubles as the check that we are back on the calendar page
+            try:
+                await page.locator(f"#DateTimeDiv, .timetable-title, {_NEXT_WEEK_SELECTOR}").first.wait_for(state="visible", timeout=5000)
+                log(f"{get_timestamp()} ✅ Successfully returned to calendar page")
+            except PlaywrightTimeoutError:
+                log(f"{get_timestamp()} ⚠️ May not be on calendar page, calendar elements not visible")
             
             # Take screenshot after returning to calendar
             await take_screenshot(page, "returned_to_calendar", slot_details, session=session)
-            
-            # Verify we're back on the calendar page
-            try:
-                # Check for calendar elements to confirm we're on the right page
-                calendar_present = await page.locator("#DateTimeDiv, .timetable-title, #ctl00_PageContent_btnNextWeek").first.is_visible(timeout=3000)
-                if calendar_present:
-                    log_msg = f"{get_timestamp()} ✅ Successfully returned to calendar page"
-                    if session:
-                        session.log_message(log_msg)
-                    else:
-                        print(log_msg)
-                else:
-                    log_msg = f"{get_timestamp()} ⚠️ May not be on calendar page, calendar elements not visible"
-                    if session:
-                        session.log_message(log_msg)
-                    else:
-                        print(log_msg)
-            except:
-                log_msg = f"{get_timestamp()} ⚠️ Could not verify calendar page presence"
-                if session:
-                    session.log_message(log_msg)
-                else:
-                    print(log_msg)
                 
         except Exception as e:
-            log_msg = f"{get_timestamp()} ⚠️ Error navigating back to calendar: {e}"
-            if session:
-                session.log_message(log_msg)
-            else:
-                print(log_msg)
+            log(f"{get_timestamp()} ⚠️ Error navigating back to calendar: {e}")
         
         return True
     except PlaywrightTimeoutError:
-        log_msg = f"{get_timestamp()} ⚠️ Slot at {target_time_str} is not available or is already booked."
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
+        log(f"{get_timestamp()} ⚠️ Slot at {target_time_str} is not available or is already booked.")
         await take_screenshot(page, f"slot_unavailable", slot_details, session=session)
         return False
 
+# Checkout anchors: whichever of these appears first tells us which page we landed on
+_PAYMENT_SUCCESS_SELECTOR = "h1:has-text('Payment Successful')"
+_CARD_FORM_SELECTOR = "input[name='cardNumber']"
+_CARDHOLDER_FORM_SELECTOR = "input[name='cardholderName']"
+_MAKE_PAYMENT_SELECTOR = "input[value='Make a payment']"
+
+async def _wait_for_next_step(page, *selectors, timeout=15000):
+    """
+    Waits until any of the given selectors is visible, instead of waiting for network idle.
+    A timeout is not an error here; the caller's own checks decide what happens next.
+    """
+    try:
+        await page.locator(", ".join(selectors)).first.wait_for(state="visible", timeout=timeout)
+    except PlaywrightTimeoutError:
+        pass
+
+async def _first_visible(candidates, timeout=15000):
+    """
+    Waits for whichever of several locators becomes visible first.
+    
+    The locators are combined with Locator.or_() so Playwright runs a single polling
+    loop, then the candidates are checked concurrently to see which one matched.
+    
+    Args:
+        candidates: Mapping of name -> Playwright locator
+        timeout: Timeout in milliseconds
+    
+    Returns:
+        str: Name of the first matching locator that is visible, or None if none appeared
+    """
+    combined = functools.reduce(lambda left, right: left.or_(right), candidates.values())
+    try:
+        await combined.first.wait_for(state="visible", timeout=timeout)
+    except PlaywrightTimeoutError:
+        return None
+    
+    # Check every candidate at once; the first visible one in mapping order wins
+    visible = await asyncio.gather(*(_is_visible_now(locator) for locator in candidates.values()))
+    for name, is_visible in zip(candidates, visible):
+        if is_visible:
+            return name
+    return None
+
+# Sets several named inputs and fires the input/change events page.fill() would
+_FILL_INPUTS_JS = """
+(values) => {
+    for (const [name, value] of Object.entries(values)) {
+        const el = document.querySelector(`input[name='${name}']`);
+        if (!el) throw new Error(`input[name='${name}'] not found`);
+        el.value = value;
+        el.dispatchEvent(new Event('input', { bubbles: true }));
+        el.dispatchEvent(new Event('change', { bubbles: true }));
+    }
+}
+"""
+
+async def _fill_inputs_by_name(page, values):
+    """
+    Fills inputs keyed by their name attribute with a single page.evaluate call.
+    
+    If the script fails (e.g. a field has not rendered yet), falls back to one
+    page.fill() per field, which waits for each input on its own.
+    """
+    try:
+        await page.evaluate(_FILL_INPUTS_JS, values)
+    except PlaywrightError:
+        for name, value in values.items():
+            await page.fill(f"input[name='{name}']", value)
+
 async def fill_payment_form(page, card_number, expiry_month, expiry_year, security_code, session=None):
     """Fill out the payment form with card details."""
+    log = session.log_message if session else print
     try:
-        log_msg = f"{get_timestamp()} --- Filling Payment Form ---"
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
+        log(f"{get_timestamp()} --- Filling Payment Form ---")
         
         # Wait for payment form to load
         await page.wait_for_selector("input[name='cardNumber']", timeout=10000)
-        log_msg = f"{get_timestamp()} Payment form detected. Filling card details..."
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
+        log(f"{get_timestamp()} Payment form detected. Filling card details...")
         
         # Take screenshot of empty payment form
         await take_screenshot(page, "payment_form_empty", session=session)
         
-        # Fill card number
-        log_msg = f"{get_timestamp()} Entering card number..."
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
-        await page.fill("input[name='cardNumber']", card_number)
-        
-        # Fill expiry month
-        log_msg = f"{get_timestamp()} Entering expiry month..."
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
-        await page.fill("input[name='expiryDate']", expiry_month)
+        # Fill card number, expiry month/year and security code in one round-trip
+        log(f"{get_timestamp()} Entering card number, expiry date and security code...")
+        await _fill_inputs_by_name(page, {
+            "cardNumber": card_number,
+            "expiryDate": expiry_month,
+            "expiryDate2": expiry_year,
+            "csc": security_code,
+        })
         
-        # Fill expiry year  
-        log_msg = f"{get_timestamp()} Entering expiry year..."
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
-        await page.fill("input[name='expiryDate2']", expiry_year)
-        
-        # Fill security code
-        log_msg = f"{get_timestamp()} Entering security code..."
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
-        await page.fill("input[name='csc']", security_code)
-        
-        log_msg = f"{get_timestamp()} ✅ Payment details filled successfully."
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
+        log(f"{get_timestamp()} ✅ Payment details filled successfully.")
         
         # Click Continue button
-        log_msg = f"{get_timestamp()} Clicking 'Continue' to submit payment..."
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
+        log(f"{get_timestamp()} Clicking 'Continue' to submit payment...")
         continue_button = page.locator("input[value='Continue']")
         await continue_button.click()
         
-        # Wait for processing
-        await page.wait_for_load_state('networkidle')
-        log_msg = f"{get_timestamp()} Payment submitted. Waiting for response..."
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
+        # Wait for processing: the cardholder form, the confirmation page or success
+        await _wait_for_next_step(page, _CARDHOLDER_FORM_SELECTOR, _MAKE_PAYMENT_SELECTOR, _PAYMENT_SUCCESS_SELECTOR)
+        log(f"{get_timestamp()} Payment submitted. Waiting for response...")
         
         return True
         
     except Exception as e:
-        log_msg = f"{get_timestamp()} ❌ Error filling payment form: {e}"
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
-        await take_screenshot(page, "payment_form_error", session=session)
+        log(f"{get_timestamp()} ❌ Error filling payment form: {e}")
+        await take_screenshot(page, "payment_form_error", session=session, full_page=True)
         return False
 
 async def fill_cardholder_details(page, cardholder_name, address, city, postcode, email, session=None):
     """Fill out the cardholder additional information form."""
+    log = session.log_message if session else print
     try:
-        log_msg = f"{get_timestamp()} --- Filling Cardholder Details ---"
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
+        log(f"{get_timestamp()} --- Filling Cardholder Details ---")
         
         # Wait for cardholder form to load
         await page.wait_for_selector("input[name='cardholderName']", timeout=10000)
-        log_msg = f"{get_timestamp()} Cardholder details form detected. Filling information..."
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
+        log(f"{get_timestamp()} Cardholder details form detected. Filling information...")
         
         # Take screenshot of empty cardholder form
         await take_screenshot(page, "cardholder_form_empty", session=session)
         
-        # Fill cardholder name
-        log_msg = f"{get_timestamp()} Entering cardholder name..."
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
-        await page.fill("input[name='cardholderName']", cardholder_name)
+        # Fill cardholder name, address, city, postcode and email in one round-trip
+        log(f"{get_timestamp()} Entering cardholder name, address, city, postcode and email...")
+        await _fill_inputs_by_name(page, {
+            "cardholderName": cardholder_name,
+            "address1": address,
+            "city": city,
+            "postcode": postcode,
+            "emailAddress": email,
+        })
         
-        # Fill address
-        log_msg = f"{get_timestamp()} Entering address..."
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
-        await page.fill("input[name='address1']", address)
-        
-        # Fill city
-        log_msg = f"{get_timestamp()} Entering city..."
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
-        await page.fill("input[name='city']", city)
-        
-        # Fill postcode
-        log_msg = f"{get_timestamp()} Entering postcode..."
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
-        await page.fill("input[name='postcode']", postcode)
-        
-        # Fill email
-        log_msg = f"{get_timestamp()} Entering email..."
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
-        await page.fill("input[name='emailAddress']", email)
-        
-        log_msg = f"{get_timestamp()} ✅ Cardholder details filled successfully."
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
+        log(f"{get_timestamp()} ✅ Cardholder details filled successfully.")
         
         # Click Continue button
-        log_msg = f"{get_timestamp()} Clicking 'Continue' to submit cardholder details..."
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
+        log(f"{get_timestamp()} Clicking 'Continue' to submit cardholder details...")
         continue_button = page.locator("input[value='Continue']")
         await continue_button.click()
         
-        # Wait for processing
-        await page.wait_for_load_state('networkidle')
-        log_msg = f"{get_timestamp()} Cardholder details submitted. Waiting for response..."
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
+        # Wait for processing: the confirmation page or success
+        await _wait_for_next_step(page, _MAKE_PAYMENT_SELECTOR, _PAYMENT_SUCCESS_SELECTOR)
+        log(f"{get_timestamp()} Cardholder details submitted. Waiting for response...")
         
         return True
         
     except Exception as e:
-        log_msg = f"{get_timestamp()} ❌ Error filling cardholder details: {e}"
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
-        await take_screenshot(page, "cardholder_details_error", session=session)
+        log(f"{get_timestamp()} ❌ Error filling cardholder details: {e}")
+        await take_screenshot(page, "cardholder_details_error", session=session, full_page=True)
         return False
 
 async def checkout_basket(page, basket_url, card_number=None, expiry_month=None, expiry_year=None, security_code=None, cardholder_name=None, address=None, city=None, postcode=None, email=None, session=None):
     """Navigates to the basket, takes screenshots, and finalises the booking."""
+    log = session.log_message if session else print
+    
+    # Progress screenshots run in the background so checkout never waits on them, and are
+    # skipped entirely when PROGRESS_SCREENSHOTS is off; outcome and error screenshots
+    # are still awaited directly.
+    background_screenshots = []
+    
+    def screenshot_in_background(reason):
+        if PROGRESS_SCREENSHOTS:
+            background_screenshots.append(schedule_screenshot(page, reason, session=session))
+    
     try:
-        log_msg = f"{get_timestamp()} --- Navigating to Basket and Checking Out ---"
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
-        await page.goto(basket_url, wait_until="domcontentloaded")
-        await take_screenshot(page, "basket_page", session=session)
+        log(f"{get_timestamp()} --- Navigating to Basket and Checking Out ---")
         
+        # Locators are lazy, so build each one once and reuse it across the checkout pages
         checkout_button = page.locator("#ctl00_PageContent_btnContinue")
+        success_locator = page.locator(_PAYMENT_SUCCESS_SELECTOR)
+        card_number_input = page.locator(_CARD_FORM_SELECTOR)
+        cardholder_name_input = page.locator(_CARDHOLDER_FORM_SELECTOR)
+        make_payment_button = page.locator(_MAKE_PAYMENT_SELECTOR)
+        
+        # The Make Booking button is the only thing needed from the basket page
+        await page.goto(basket_url, wait_until="commit")
         await checkout_button.wait_for(state="visible", timeout=10000)
+        screenshot_in_background("basket_page")
         
-        log_msg = f"{get_timestamp()} Basket page loaded. Clicking 'Make Booking'..."
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
+        
+        log(f"{get_timestamp()} Basket page loaded. Clicking 'Make Booking'...")
         await checkout_button.click()
         
-        await page.wait_for_load_state('networkidle')
-        await take_screenshot(page, "after_make_booking", session=session)
+        # Race the possible landing pages instead of probing them one after another
+        log(f"{get_timestamp()} Checking for immediate Payment Successful page...")
+        landing_page = await _first_visible({
+            "success": success_locator,
+            "card": card_number_input,
+            "cardholder": cardholder_name_input,
+        })
+        screenshot_in_background("after_make_booking")
         
         # First check if we directly reached the Payment Successful page (sufficient credit route)
-        log_msg = f"{get_timestamp()} Checking for immediate Payment Successful page..."
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
-        success_locator = page.locator("h1:has-text('Payment Successful')")
-        immediate_success = await success_locator.is_visible(timeout=3000)
-        
-        if immediate_success:
-            log_msg = f"{get_timestamp()} ✅ 'Payment Successful' found immediately - sufficient credit route!"
-            if session:
-                session.log_message(log_msg)
-            else:
-                print(log_msg)
-            await take_screenshot(page, "payment_successful_direct", session=session)
+        if landing_page == "success":
+            log(f"{get_timestamp()} ✅ 'Payment Successful' found immediately - sufficient credit route!")
+            await take_screenshot(page, "payment_successful_direct", session=session, jpeg=False)
             return True
         
         # If not successful yet, check for payment form (insufficient credit route)
-        log_msg = f"{get_timestamp()} Payment not immediately successful, checking for payment forms..."
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
-        payment_form_exists = await page.locator("input[name='cardNumber']").is_visible(timeout=5000)
+        log(f"{get_timestamp()} Payment not immediately successful, checking for payment forms...")
+        payment_form_exists = landing_page == "card"
         
         if payment_form_exists and card_number:
-            log_msg = f"{get_timestamp()} Payment form detected. Processing card payment flow..."
-            if session:
-                session.log_message(log_msg)
-            else:
-                print(log_msg)
+            log(f"{get_timestamp()} Payment form detected. Processing card payment flow...")
             payment_success = await fill_payment_form(page, card_number, expiry_month, expiry_year, security_code, session=session)
             if not payment_success:
                 return False
             
-            # Check if we're now on the cardholder details page
-            await page.wait_for_load_state('networkidle')
-            await take_screenshot(page, "after_payment_form", session=session)
+            # Check if we're now on the cardholder details page (fill_payment_form already waited for it)
+            screenshot_in_background("after_payment_form")
             
-            cardholder_form_exists = await page.locator("input[name='cardholderName']").is_visible(timeout=5000)
+            cardholder_form_exists = await cardholder_name_input.is_visible(timeout=5000)
             
             if cardholder_form_exists and cardholder_name:
-                log_msg = f"{get_timestamp()} Cardholder details form detected. Processing cardholder information..."
-                if session:
-                    session.log_message(log_msg)
-                else:
-                    print(log_msg)
+                log(f"{get_timestamp()} Cardholder details form detected. Processing cardholder information...")
                 cardholder_success = await fill_cardholder_details(page, cardholder_name, address, city, postcode, email, session=session)
                 if not cardholder_success:
                     return False
             elif cardholder_form_exists and not cardholder_name:
-                log_msg = f"{get_timestamp()} ❌ Cardholder details form detected but no cardholder details provided."
-                if session:
-                    session.log_message(log_msg)
-                else:
-                    print(log_msg)
+                log(f"{get_timestamp()} ❌ Cardholder details form detected but no cardholder details provided.")
                 await take_screenshot(page, "cardholder_form_no_details", session=session)
                 return False
             
             # Check if we're on the payment confirmation page with "Make a payment" button
-            await page.wait_for_load_state('networkidle')
-            await take_screenshot(page, "after_cardholder_details", session=session)
+            await _wait_for_next_step(page, _MAKE_PAYMENT_SELECTOR, _PAYMENT_SUCCESS_SELECTOR)
+            screenshot_in_background("after_cardholder_details")
             
-            make_payment_button = page.locator("input[value='Make a payment']")
             make_payment_exists = await make_payment_button.is_visible(timeout=5000)
             
             if make_payment_exists:
-                log_msg = f"{get_timestamp()} Payment confirmation page detected. Clicking 'Make a payment'..."
-                if session:
-                    session.log_message(log_msg)
-                else:
-                    print(log_msg)
+                log(f"{get_timestamp()} Payment confirmation page detected. Clicking 'Make a payment'...")
                 await make_payment_button.click()
-                await page.wait_for_load_state('networkidle')
-                await take_screenshot(page, "after_make_payment", session=session)
+                await _wait_for_next_step(page, _PAYMENT_SUCCESS_SELECTOR)
+                screenshot_in_background("after_make_payment")
                 
         elif payment_form_exists and not card_number:
-            log_msg = f"{get_timestamp()} ❌ Payment form detected but no card details provided."
-            if session:
-                session.log_message(log_msg)
-            else:
-                print(log_msg)
+            log(f"{get_timestamp()} ❌ Payment form detected but no card details provided.")
             await take_screenshot(page, "payment_form_no_details", session=session)
             return False
         else:
-            log_msg = f"{get_timestamp()} No payment form detected, checking for other elements..."
-            if session:
-                session.log_message(log_msg)
-            else:
-                print(log_msg)
+            log(f"{get_timestamp()} No payment form detected, checking for other elements...")
         
-        # Final check for Payment Successful (after card payment flow)
-        log_msg = f"{get_timestamp()} Performing final check for Payment Successful page..."
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
+        # Final check for Payment Successful (after card payment flow). If no page was
+        # detected after Make Booking, the race above already waited the full budget for
+        # this heading, so only a short re-check is needed.
+        final_check_timeout = 3000 if landing_page is None else 15000
+        log(f"{get_timestamp()} Performing final check for Payment Successful page...")
         try:
-            await success_locator.wait_for(state="visible", timeout=15000)
-            log_msg = f"{get_timestamp()} ✅ 'Payment Successful' text found after payment flow. Booking is confirmed!"
-            if session:
-                session.log_message(log_msg)
-            else:
-                print(log_msg)
-            await take_screenshot(page, "payment_successful_after_card_flow", session=session)
+            await success_locator.wait_for(state="visible", timeout=final_check_timeout)
+            log(f"{get_timestamp()} ✅ 'Payment Successful' text found after payment flow. Booking is confirmed!")
+            await take_screenshot(page, "payment_successful_after_card_flow", session=session, jpeg=False)
             return True
         except PlaywrightTimeoutError:
-            log_msg = f"{get_timestamp()} ❌ 'Payment Successful' text NOT found. Booking may have failed."
-            if session:
-                session.log_message(log_msg)
-            else:
-                print(log_msg)
+            log(f"{get_timestamp()} ❌ 'Payment Successful' text NOT found. Booking may have failed.")
             await take_screenshot(page, "payment_final_fail", session=session)
             return False
 
     except PlaywrightTimeoutError as e:
-        log_msg = f"{get_timestamp()} ❌ Timeout during checkout process: {e}"
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
-        await take_screenshot(page, "checkout_timeout_error", session=session)
+        log(f"{get_timestamp()} ❌ Timeout during checkout process: {e}")
+        await take_screenshot(page, "checkout_timeout_error", session=session, full_page=True)
         return False
     except Exception as e:
-        log_msg = f"{get_timestamp()} ❌ Unexpected error during checkout: {e}"
-        if session:
-            session.log_message(log_msg)
-        else:
-            print(log_msg)
-        await take_screenshot(page, "checkout_critical_error", session=session)
+        log(f"{get_timestamp()} ❌ Unexpected error during checkout: {e}")
+        await take_screenshot(page, "checkout_critical_error", session=session, full_page=True)
         return False
+    finally:
+        # Make sure every progress screenshot is on disk and recorded before returning
+        await asyncio.gather(*background_screenshots, return_exceptions=True)
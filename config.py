@@ -93,3 +93,6 @@ LB_POSTCODE = os.environ.get("LB_POSTCODE")
 # KEEP_BROWSER_OPEN=true - Keeps browser open after completion (default: false)
 SHOW_BROWSER = os.environ.get("SHOW_BROWSER", "false").lower() == "true"
 KEEP_BROWSER_OPEN = os.environ.get("KEEP_BROWSER_OPEN", "false").lower() == "true"
+# PROGRESS_SCREENSHOTS=false - Skips the intermediate checkout screenshots (default: true)
+# Outcome and error screenshots are always taken.
+PROGRESS_SCREENSHOTS = os.environ.get("PROGRESS_SCREENSHOTS", "true").lower() == "true"
@@ -96,13 +96,18 @@ class EmailManager:
         """
         Send a single email using Gmail SMTP with optional screenshot attachments.
         
+        The message is built and serialized once; when several recipients are given
+        they all receive it in a single SMTP transaction.
+        
         Args:
-            recipient (str): Email address to send to
+            recipient (str or list): Email address (or list of addresses) to send to
             subject (str): Email subject line
             body (str): Email body content
             screenshot_paths (list, optional): List of screenshot file paths to attach
             
         Raises:
+            smtplib.SMTPRecipientsRefused: If any recipient was refused; the
+                exception's recipients dict maps each refused address to its SMTP error
             Exception: If email sending fails
         """
         server = None
@@ -116,13 +121,14 @@ class EmailManager:
                 print(f"{get_timestamp()}     📸 Screenshots to attach: {len(screenshot_paths)}")
             
             # Validate inputs
-            if not recipient:
+            recipients = [recipient] if isinstance(recipient, str) else [r for r in (recipient or []) if r]
+            if not recipients or not recipients[0]:
                 raise ValueError("Recipient email is required")
             
             # Create message
             msg = MIMEMultipart()
             msg['From'] = self.sender_email
-            msg['To'] = recipient
+            msg['To'] = ", ".join(recipients)
             msg['Subject'] = subject
             
             msg.attach(MIMEText(body, 'plain', 'utf-8'))
@@ -146,13 +152,12 @@ class EmailManager:
             
             # Send email
             text = msg.as_string()
-            result = server.sendmail(self.sender_email, [recipient], text)
+            result = server.sendmail(self.sender_email, recipients, text)
             
-            # Check if there were any failed recipients
+            # sendmail() only raises when every recipient is refused; report partial failures too
             if result:
-                print(f"{get_timestamp()}     ⚠️ SMTP: Some recipients failed: {result}")
-            else:
-                print(f"{get_timestamp()}     ✅ SMTP: Email sent successfully to {recipient}")
+                raise smtplib.SMTPRecipientsRefused(result)
+            print(f"{get_timestamp()}     ✅ SMTP: Email sent successfully to {recipient}")
             
         except smtplib.SMTPAuthenticationError as e:
             print(f"{get_timestamp()} ❌ SMTP Authentication failed for {self.sender_email}: {e}")
@@ -460,12 +465,21 @@ This is an automated summary report from the Tennis Court Booking System.
             
             print(f"{get_timestamp()}   📸 Including {len(all_screenshot_paths)} screenshots from all sessions as attachments")
             
-            # Send to all recipients
-            for recipient in recipients:
-                if recipient:
-                    print(f"{get_timestamp()}   📧 Sending summary email to {recipient}")
-                    await self.send_email(recipient, subject, body, all_screenshot_paths)
-                    print(f"{get_timestamp()} ✅ Summary email sent to {recipient}")
+            # Send to all recipients in one SMTP transaction (message is built and serialized once)
+            valid_recipients = [recipient for recipient in recipients if recipient]
+            if valid_recipients:
+                print(f"{get_timestamp()}   📧 Sending summary email to {', '.join(valid_recipients)}")
+                try:
+                    await self.send_email(valid_recipients, subject, body, all_screenshot_paths)
+                    refused = {}
+                except smtplib.SMTPRecipientsRefused as e:
+                    refused = e.recipients
+                
+                for recipient in valid_recipients:
+                    if recipient in refused:
+                        print(f"{get_timestamp()} ❌ Summary email to {recipient} failed: {refused[recipient]}")
+                    else:
+                        print(f"{get_timestamp()} ✅ Summary email sent to {recipient}")
             
         except Exception as e:
             print(f"{get_timestamp()} ❌ Error sending summary email: {e}")
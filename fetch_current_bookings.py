@@ -28,20 +28,12 @@ from config import (
 )
 from sheets_manager import SheetsManager
 from utils import get_timestamp, get_london_datetime
+from browser_actions import take_screenshot
 
 
 async def take_screenshot_on_error(page: Page, account_name: str, reason: str):
-    """Takes a screenshot on error for debugging."""
-    screenshot_dir = "screenshots"
-    os.makedirs(screenshot_dir, exist_ok=True)
-    timestamp = get_london_datetime().strftime("%y%m%d_%H%M%S")
-    filename = f"{timestamp}_{account_name}_{reason}.png"
-    filepath = os.path.join(screenshot_dir, filename)
-    try:
-        await page.screenshot(path=filepath, full_page=True)
-        print(f"{get_timestamp()} 📸 Screenshot saved for {account_name}: {filepath}")
-    except Exception as e:
-        print(f"{get_timestamp()} ❌ Could not save screenshot for {account_name}. Error: {e}")
+    """Takes a full-page screenshot on error for debugging, via the shared browser_actions helper."""
+    await take_screenshot(page, f"{account_name}_{reason}", full_page=True)
 
 
 class BookingFetcher:
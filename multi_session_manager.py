@@ -12,9 +12,61 @@ from browser_actions import (
     find_date_on_calendar,
     book_slot,
     checkout_basket,
-    take_screenshot
+    take_screenshot,
+    drain_screenshots
 )
-from utils import get_timestamp
+from config import (
+    LOGIN_URL, BASKET_URL, LB_CARD_NUMBER, LB_CARD_EXPIRY_MONTH, LB_CARD_EXPIRY_YEAR,
+    LB_CARD_SECURITY_CODE, LB_CARDHOLDER_NAME, LB_ADDRESS, LB_CITY, LB_POSTCODE
+)
+from utils import get_timestamp, get_log_timestamp, get_london_datetime
+
+
+class BrowserPool:
+    """One Chromium instance shared by every booking session.
+
+    Launching Chromium costs a second or more, so the browser is started once on
+    first use and each session gets its own context (separate cookies and login)
+    rather than its own browser process.
+    """
+
+    def __init__(self):
+        self.playwright = None
+        self.browser = None
+        self._launch_lock = asyncio.Lock()
+
+    async def acquire(self, headless=True):
+        """
+        Open an isolated context and page on the shared browser.
+
+        Args:
+            headless (bool): Headless mode used if the browser still has to be launched
+
+        Returns:
+            tuple: (BrowserContext, Page) for the caller to use until release()
+        """
+        async with self._launch_lock:
+            if self.browser is None:
+                self.playwright = await async_playwright().start()
+                self.browser = await self.playwright.chromium.launch(headless=headless)
+        context = await self.browser.new_context()
+        page = await context.new_page()
+        return context, page
+
+    async def release(self, context):
+        """Close a context handed out by acquire(); the browser stays up."""
+        if context:
+            await context.close()
+
+    async def close(self):
+        """Shut down the shared browser and Playwright."""
+        if self.browser:
+            await self.browser.close()
+            self.browser = None
+        if self.playwright:
+            await self.playwright.stop()
+            self.playwright = None
+
 
 class BookingSession:
     """Represents a single booking session for one court/email combination."""
@@ -42,6 +94,8 @@ class BookingSession:
         self.browser = None
         self.page = None
         self.playwright = None
+        self.context = None
+        self.browser_pool = None
         
         # Session state
         self.is_logged_in = False
@@ -60,15 +114,19 @@ class BookingSession:
     
     def log_message(self, message):
         """Capture a log message for this session."""
-        from utils import get_london_datetime
-        timestamp = get_london_datetime().strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]  # Include milliseconds
+        timestamp = get_log_timestamp()  # Includes milliseconds
         log_entry = f"[{timestamp}] {message}"
         self.session_logs.append(log_entry)
         print(message)  # Still print to terminal
     
+    def log_messages(self, messages):
+        """Capture a block of related log messages with one timestamp and one terminal write."""
+        timestamp = get_log_timestamp()  # Includes milliseconds
+        self.session_logs.extend(f"[{timestamp}] {message}" for message in messages)
+        print("\n".join(messages))  # Still print to terminal
+    
     def add_screenshot(self, screenshot_path, description=""):
         """Track a screenshot taken during this session."""
-        from utils import get_london_datetime
         timestamp = get_london_datetime().strftime('%Y-%m-%d %H:%M:%S')
         screenshot_info = {
             'path': screenshot_path,
@@ -77,14 +135,25 @@ class BookingSession:
         }
         self.screenshots_taken.append(screenshot_info)
     
-    async def initialize_browser(self, headless=os.environ.get('HEADLESS_MODE', 'True').lower() == 'true'):
-        """Initialize the browser session with simplified headless parameter logic."""
+    async def initialize_browser(self, headless=os.environ.get('HEADLESS_MODE', 'True').lower() == 'true', browser_pool=None):
+        """
+        Initialize the browser session with simplified headless parameter logic.
+        
+        Args:
+            headless (bool): Whether to run the browser headless
+            browser_pool (BrowserPool): Shared browser to open a context on; when
+                omitted the session launches a browser of its own
+        """
         try:
             self.log_message(f"{get_timestamp()} --- Initializing browser for {self.account_name} ({self.court_number}) ---")
             
-            self.playwright = await async_playwright().start()
-            self.browser = await self.playwright.chromium.launch(headless=headless)
-            self.page = await self.browser.new_page()
+            if browser_pool:
+                self.browser_pool = browser_pool
+                self.context, self.page = await browser_pool.acquire(headless)
+            else:
+                self.playwright = await async_playwright().start()
+                self.browser = await self.playwright.chromium.launch(headless=headless)
+                self.page = await self.browser.new_page()
             
             self.log_message(f"{get_timestamp()} ✅ Browser initialized for {self.account_name} (headless={headless})")
             return True
@@ -98,8 +167,6 @@ class BookingSession:
         try:
             print(f"{get_timestamp()} --- Logging in {self.account_name} ({self.email}) ---")
 
-            from config import LOGIN_URL
-
             # Navigate to login page
             await self.page.goto(LOGIN_URL)
 
@@ -205,23 +272,28 @@ class BookingSession:
                 else:
                     self.failed_bookings.append(slot_details)
             
-            self.log_message(f"{get_timestamp()} === {self.account_name} BOOKING SESSION COMPLETE ===")
-            self.log_message(f"{get_timestamp()} 📊 Total attempts: {self.total_attempts}")
-            self.log_message(f"{get_timestamp()} 📊 Successful bookings: {len(self.successful_bookings)}")
-            self.log_message(f"{get_timestamp()} 📊 Failed bookings: {len(self.failed_bookings)}")
-            self.log_message(f"{get_timestamp()} 📊 Basket summary: {len(self.successful_bookings)} added, {len(self.failed_bookings)} failed.")
+            ts = get_timestamp()
+            summary_lines = [
+                f"{ts} === {self.account_name} BOOKING SESSION COMPLETE ===",
+                f"{ts} 📊 Total attempts: {self.total_attempts}",
+                f"{ts} 📊 Successful bookings: {len(self.successful_bookings)}",
+                f"{ts} 📊 Failed bookings: {len(self.failed_bookings)}",
+                f"{ts} 📊 Basket summary: {len(self.successful_bookings)} added, {len(self.failed_bookings)} failed.",
+            ]
             
             if self.successful_bookings:
-                self.log_message(f"{get_timestamp()} ✅ Successfully added to basket:")
+                summary_lines.append(f"{ts} ✅ Successfully added to basket:")
                 for booking in self.successful_bookings:
                     court_url, date, time = booking
-                    self.log_message(f"{get_timestamp()}   - {time} on {date}")
+                    summary_lines.append(f"{ts}   - {time} on {date}")
             
             if self.failed_bookings:
-                self.log_message(f"{get_timestamp()} ❌ Failed to add to basket:")
+                summary_lines.append(f"{ts} ❌ Failed to add to basket:")
                 for booking in self.failed_bookings:
                     court_url, date, time = booking
-                    self.log_message(f"{get_timestamp()}   - {time} on {date}")
+                    summary_lines.append(f"{ts}   - {time} on {date}")
+            
+            self.log_messages(summary_lines)
             
             return len(self.successful_bookings) > 0
 
@@ -233,22 +305,29 @@ class BookingSession:
                 self.failed_bookings.append((self.court_url, target_date, slot_time))
             return False
     
+    def _booking_log_entries(self, bookings, status, error_details):
+        """Build Booking Log entries for (court_url, date, time) tuples with one status."""
+        return [
+            self.sheets_manager.create_log_entry(
+                email=self.email,
+                court=self.court_number,
+                date=date,
+                time=time,
+                status=status,
+                error_details=error_details
+            )
+            for court_url, date, time in bookings
+        ]
+    
     async def checkout(self):
         """Process checkout and log the final status of all booking attempts."""
         try:
             # First, log all slots that failed before even getting to the basket
             if self.failed_bookings:
                 self.log_message(f"{get_timestamp()} --- Logging {len(self.failed_bookings)} pre-checkout failures for {self.account_name} ---")
-                for court_url, date, time in self.failed_bookings:
-                    log_entry = self.sheets_manager.create_log_entry(
-                        email=self.email,
-                        court=self.court_number,
-                        date=date,
-                        time=time,
-                        status='❌ Failed',
-                        error_details='Slot not available or pre-booking failed'
-                    )
-                    self.sheets_manager.write_booking_log(log_entry)
+                self.sheets_manager.write_booking_logs(self._booking_log_entries(
+                    self.failed_bookings, '❌ Failed', 'Slot not available or pre-booking failed'
+                ))
 
             # Now, process the checkout for bookings that made it to the basket
             if not self.successful_bookings:
@@ -257,11 +336,6 @@ class BookingSession:
 
             self.log_message(f"{get_timestamp()} --- {self.account_name} checking out {len(self.successful_bookings)} bookings ---")
 
-            from config import (
-                BASKET_URL, LB_CARD_NUMBER, LB_CARD_EXPIRY_MONTH, LB_CARD_EXPIRY_YEAR,
-                LB_CARD_SECURITY_CODE, LB_CARDHOLDER_NAME, LB_ADDRESS, LB_CITY, LB_POSTCODE
-            )
-
             checkout_success = await checkout_basket(
                 self.page, BASKET_URL, LB_CARD_NUMBER, LB_CARD_EXPIRY_MONTH,
                 LB_CARD_EXPIRY_YEAR, LB_CARD_SECURITY_CODE, LB_CARDHOLDER_NAME,
@@ -283,51 +357,27 @@ class BookingSession:
             # Log the final outcome for all slots that were in the basket
             self.log_message(f"{get_timestamp()} --- Logging final status for {len(self.successful_bookings) + len(self.failed_bookings)} basket items for {self.account_name} ---")
             
-            # Log successful bookings
-            for court_url, date, time in self.successful_bookings:
-                log_entry = self.sheets_manager.create_log_entry(
-                    email=self.email,
-                    court=self.court_number,
-                    date=date,
-                    time=time,
-                    status=final_status,
-                    error_details=error_details
-                )
-                self.sheets_manager.write_booking_log(log_entry)
-
-            # Log failed bookings (including those that failed during checkout)
-            for court_url, date, time in self.failed_bookings:
-                log_entry = self.sheets_manager.create_log_entry(
-                    email=self.email,
-                    court=self.court_number,
-                    date=date,
-                    time=time,
-                    status='❌ Checkout Failed',
-                    error_details='Payment failed or checkout timed out'
-                )
-                self.sheets_manager.write_booking_log(log_entry)
+            # Log successful bookings, then failed bookings (including those that failed
+            # during checkout), in a single Sheets write
+            self.sheets_manager.write_booking_logs(
+                self._booking_log_entries(self.successful_bookings, final_status, error_details)
+                + self._booking_log_entries(self.failed_bookings, '❌ Checkout Failed', 'Payment failed or checkout timed out')
+            )
 
 
             return checkout_success
 
         except Exception as e:
             self.log_message(f"❌ Critical error during checkout for {self.account_name}: {e}")
-            await take_screenshot(self.page, f"checkout_error_{self.account_name.lower()}", session=self)
+            await take_screenshot(self.page, f"checkout_error_{self.account_name.lower()}", session=self, full_page=True)
             
             # If a critical error happens during checkout, log all basket items as failed
             if self.successful_bookings:
                 self.failed_bookings.extend(self.successful_bookings)
                 self.successful_bookings.clear()
-                for court_url, date, time in self.failed_bookings:
-                    log_entry = self.sheets_manager.create_log_entry(
-                        email=self.email,
-                        court=self.court_number,
-                        date=date,
-                        time=time,
-                        status='❌ Checkout Failed',
-                        error_details=f'Critical error in checkout process: {str(e)}'
-                    )
-                    self.sheets_manager.write_booking_log(log_entry)
+                self.sheets_manager.write_booking_logs(self._booking_log_entries(
+                    self.failed_bookings, '❌ Checkout Failed', f'Critical error in checkout process: {str(e)}'
+                ))
             return False
     
     async def logout(self):
@@ -355,6 +405,8 @@ class BookingSession:
     async def cleanup(self):
         """Clean up browser resources."""
         try:
+            if self.browser_pool:
+                await self.browser_pool.release(self.context)
             if self.browser:
                 await self.browser.close()
             if self.playwright:
@@ -375,6 +427,7 @@ class MultiSessionManager:
         """
         self.sheets_manager = sheets_manager
         self.sessions = []
+        self.browser_pool = BrowserPool()
         self.all_successful_bookings = []
         self.all_failed_bookings = []
     
@@ -433,7 +486,7 @@ class MultiSessionManager:
                 session.assigned_time_slot = time_slot
                 
                 # Initialize browser
-                if await session.initialize_browser(headless):
+                if await session.initialize_browser(headless, browser_pool=self.browser_pool):
                     self.sessions.append(session)
                     print(f"{get_timestamp()} ✅ Session initialized: {account_name} -> {court_number} -> {time_slot}")
                 else:
@@ -615,9 +668,13 @@ class MultiSessionManager:
         try:
             self.broadcast_message(f"{get_timestamp()} === Cleaning up all sessions ===")
             
+            # Let background screenshots land (and be recorded for the emails) before the pages close
+            await drain_screenshots()
+            
             # Cleanup all sessions concurrently
             cleanup_tasks = [session.cleanup() for session in self.sessions]
             await asyncio.gather(*cleanup_tasks, return_exceptions=True)
+            await self.browser_pool.close()
             
             self.broadcast_message(f"{get_timestamp()} ✅ All sessions cleaned up")
             
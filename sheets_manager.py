@@ -8,6 +8,7 @@ from datetime import datetime
 from google.oauth2 import service_account
 import gspread
 from gspread.exceptions import WorksheetNotFound, APIError, SpreadsheetNotFound
+from gspread.utils import absolute_range_name, fill_gaps
 import requests
 from utils import get_timestamp, get_london_datetime
 
@@ -130,6 +131,49 @@ class SheetsManager:
         print(f"{get_timestamp()} ❌ Failed after {max_retries + 1} attempts. Last error: {last_exception}")
         raise last_exception
     
+    def _get_all_values(self, worksheet_name):
+        """
+        Fetch every cell of a worksheet with a single values.get request.
+        
+        Equivalent to spreadsheet.worksheet(name).get_all_values(), but skips the
+        spreadsheet metadata request that looking up the Worksheet object costs.
+        
+        Args:
+            worksheet_name (str): Name of the worksheet to read
+            
+        Returns:
+            list: Rows of cell strings, padded to a rectangle like get_all_values()
+            
+        Raises:
+            WorksheetNotFound: If worksheet doesn't exist
+        """
+        response = self._retry_api_call(self._values_get, worksheet_name)
+        return fill_gaps(response.get('values', []))
+    
+    def _values_get(self, worksheet_name):
+        """
+        Issue the values.get request for a whole worksheet.
+        
+        values.get reports an unknown tab as an unparseable range; that is mapped to
+        WorksheetNotFound here, so _retry_api_call treats it as a missing resource
+        rather than logging it as a non-retryable API error.
+        
+        Args:
+            worksheet_name (str): Name of the worksheet to read
+            
+        Returns:
+            dict: The values.get response
+            
+        Raises:
+            WorksheetNotFound: If worksheet doesn't exist
+        """
+        try:
+            return self.spreadsheet.values_get(absolute_range_name(worksheet_name))
+        except APIError as e:
+            if "Unable to parse range" in str(e):
+                raise WorksheetNotFound(worksheet_name) from e
+            raise
+    
     def _read_worksheet_to_dicts(self, worksheet_name, description=""):
         """
         Private helper method to read a worksheet and convert to list of dictionaries.
@@ -149,8 +193,7 @@ class SheetsManager:
         try:
             print(f"{get_timestamp()} --- Reading {worksheet_name} Sheet{' (' + description + ')' if description else ''} ---")
             
-            worksheet = self._retry_api_call(self.spreadsheet.worksheet, worksheet_name)
-            all_values = self._retry_api_call(worksheet.get_all_values)
+            all_values = self._get_all_values(worksheet_name)
             
             if len(all_values) < 2:
                 raise ValueError(f"{worksheet_name} sheet must have at least a header row and one data row")
@@ -235,26 +278,44 @@ class SheetsManager:
             log_entry (dict): Dictionary with log entry data
                 Required keys: Timestamp, Email, Court, Date, Time, Status, Error Details
         """
+        self.write_booking_logs([log_entry])
+    
+    def write_booking_logs(self, log_entries):
+        """
+        Write several entries to the Booking Log sheet with a single insert (adds to top).
+        
+        The rows end up in the same order as if each entry had been written with
+        write_booking_log() in turn, i.e. the last entry on top.
+        
+        Args:
+            log_entries (list): Log entry dictionaries, see write_booking_log()
+        """
+        if not log_entries:
+            return
+        
         try:
-            print(f"{get_timestamp()} --- Writing to Booking Log ---")
+            print(f"{get_timestamp()} --- Writing {len(log_entries)} entr{'y' if len(log_entries) == 1 else 'ies'} to Booking Log ---")
             
             worksheet = self._retry_api_call(self.spreadsheet.worksheet, "Booking Log")
             
-            # Prepare the row data
-            row_data = [
-                log_entry.get('Timestamp', ''),
-                log_entry.get('Email', ''),
-                log_entry.get('Court', ''),
-                log_entry.get('Date', ''),
-                log_entry.get('Time', ''),
-                log_entry.get('Status', ''),
-                log_entry.get('Error Details', '')
+            # Prepare the row data, newest first
+            rows = [
+                [
+                    log_entry.get('Timestamp', ''),
+                    log_entry.get('Email', ''),
+                    log_entry.get('Court', ''),
+                    log_entry.get('Date', ''),
+                    log_entry.get('Time', ''),
+                    log_entry.get('Status', ''),
+                    log_entry.get('Error Details', '')
+                ]
+                for log_entry in reversed(log_entries)
             ]
             
             # Insert at row 2 (after header)
-            self._retry_api_call(worksheet.insert_row, row_data, 2)
+            self._retry_api_call(worksheet.insert_rows, rows, 2)
             
-            print(f"{get_timestamp()} ✅ Successfully logged booking entry")
+            print(f"{get_timestamp()} ✅ Successfully logged {len(rows)} booking entr{'y' if len(rows) == 1 else 'ies'}")
             
         except WorksheetNotFound:
             print(f"{get_timestamp()} ❌ Booking log sheet not found")
@@ -278,8 +339,7 @@ class SheetsManager:
         try:
             print(f"{get_timestamp()} --- Reading Booking Log (limit={limit}, offset={offset}, get_all={get_all}) ---")
             
-            worksheet = self._retry_api_call(self.spreadsheet.worksheet, "Booking Log")
-            all_values = self._retry_api_call(worksheet.get_all_values)
+            all_values = self._get_all_values("Booking Log")
             
             if len(all_values) <= 1:  # Only header or empty
                 return {
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared BrowserPool used by MultiSessionManager.
+"""
+
+import asyncio
+import unittest
+from unittest.mock import patch, MagicMock, AsyncMock
+import sys
+import os
+
+# Add the parent directory to the Python path to import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from multi_session_manager import BrowserPool, BookingSession
+
+
+class TestBrowserPool(unittest.TestCase):
+    """Test suite for sharing one Chromium instance across sessions."""
+
+    def setUp(self):
+        """Set up a mocked Playwright/Chromium chain."""
+        self.mock_browser = MagicMock()
+        self.mock_browser.close = AsyncMock()
+        self.mock_browser.new_context = AsyncMock(side_effect=self._new_context)
+
+        self.mock_playwright = MagicMock()
+        self.mock_playwright.chromium.launch = AsyncMock(return_value=self.mock_browser)
+        self.mock_playwright.stop = AsyncMock()
+
+        self.mock_starter = MagicMock()
+        self.mock_starter.start = AsyncMock(return_value=self.mock_playwright)
+
+    async def _new_context(self):
+        context = MagicMock()
+        context.new_page = AsyncMock(return_value=MagicMock())
+        context.close = AsyncMock()
+        return context
+
+    def test_sessions_share_one_browser(self):
+        """Test that several sessions launch Chromium once but get separate contexts."""
+        sessions = [
+            BookingSession(name, f"{name}@example.com", "pw", "Court 1", "https://example.com", None)
+            for name in ("Mother", "Father", "Bruce")
+        ]
+        pool = BrowserPool()
+
+        async def run():
+            results = await asyncio.gather(*[
+                session.initialize_browser(True, browser_pool=pool) for session in sessions
+            ])
+            for session in sessions:
+                await session.cleanup()
+            await pool.close()
+            return results
+
+        with patch('multi_session_manager.async_playwright', return_value=self.mock_starter):
+            results = asyncio.run(run())
+
+        self.assertEqual(results, [True, True, True])
+        self.mock_playwright.chromium.launch.assert_called_once_with(headless=True)
+        self.assertEqual(self.mock_browser.new_context.await_count, 3)
+        self.assertEqual(len({id(session.context) for session in sessions}), 3)
+        for session in sessions:
+            session.context.close.assert_awaited_once()
+        self.mock_browser.close.assert_awaited_once()
+        self.mock_playwright.stop.assert_awaited_once()
+
+    def test_close_without_launch_is_noop(self):
+        """Test that closing an unused pool does not start Playwright."""
+        with patch('multi_session_manager.async_playwright') as mock_async_playwright:
+            asyncio.run(BrowserPool().close())
+        mock_async_playwright.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
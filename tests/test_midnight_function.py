@@ -19,13 +19,19 @@ class TestMidnightFunction:
     async def test_optimized_countdown_logging_5_seconds(self):
         """Test countdown logging for 5 seconds and verify output messages."""
         with patch('asyncio.sleep') as mock_sleep, \
+             patch('browser_actions.time') as mock_time, \
              patch('builtins.print') as mock_print:
             
+            # Fake monotonic clock that only advances when the countdown sleeps
+            clock = [0.0]
+            mock_time.monotonic.side_effect = lambda: clock[0]
+            
             # Mock the function to return after each sleep call
             call_count = 0
             def mock_sleep_side_effect(seconds):
                 nonlocal call_count
                 call_count += 1
+                clock[0] += seconds
                 if call_count >= 5:  # Stop after 5 calls
                     raise asyncio.CancelledError()
                 return None
@@ -57,13 +63,19 @@ class TestMidnightFunction:
     async def test_optimized_countdown_logging_15_seconds(self):
         """Test countdown logging for 15 seconds and verify message content."""
         with patch('asyncio.sleep') as mock_sleep, \
+             patch('browser_actions.time') as mock_time, \
              patch('builtins.print') as mock_print:
             
+            # Fake monotonic clock that only advances when the countdown sleeps
+            clock = [0.0]
+            mock_time.monotonic.side_effect = lambda: clock[0]
+            
             # Mock the function to return after each sleep call  
             call_count = 0
             def mock_sleep_side_effect(seconds):
                 nonlocal call_count
                 call_count += 1
+                clock[0] += seconds
                 if call_count >= 6:  # Stop after 6 calls (1x10s + 5x1s)
                     raise asyncio.CancelledError()
                 return None
@@ -65,7 +65,7 @@ class TestMidnightStrategicTiming(unittest.TestCase):
         mock_datetime.now.return_value = mock_now
         
         # Test the function
-        result = asyncio.run(check_london_time_near_midnight())
+        result = check_london_time_near_midnight()
         
         # Assertions
         self.assertTrue(result[0], "Should detect being near midnight at 23:55")
@@ -87,7 +87,7 @@ class TestMidnightStrategicTiming(unittest.TestCase):
         mock_datetime.now.return_value = mock_now
         
         # Test the function
-        result = asyncio.run(check_london_time_near_midnight())
+        result = check_london_time_near_midnight()
         
         # Assertions
         self.assertFalse(result[0], "Should NOT detect being near midnight at 23:30")
@@ -107,7 +107,7 @@ class TestMidnightStrategicTiming(unittest.TestCase):
         mock_datetime.now.return_value = mock_now
         
         # Test the function
-        result = asyncio.run(check_london_time_near_midnight())
+        result = check_london_time_near_midnight()
         
         # Assertions
         self.assertFalse(result[0], "Should NOT detect being near midnight at exactly 00:00")
@@ -323,7 +323,7 @@ class TestMidnightFunctionRobustness(unittest.TestCase):
         mock_now.minute = 55
         mock_datetime.now.return_value = mock_now
         
-        result = asyncio.run(check_london_time_near_midnight())
+        result = check_london_time_near_midnight()
         
         # Should still work correctly
         self.assertTrue(result[0])
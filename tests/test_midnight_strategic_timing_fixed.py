@@ -4,7 +4,7 @@ Fixed comprehensive tests for the strategic timing and midnight wait functionali
 
 This test suite validates:
 1. Midnight detection logic
-2. Strategic timing approach (3 weeks advance)
+2. Strategic timing approach (2 weeks advance)
 3. Wait until midnight functionality
 4. London timezone handling
 5. Complete flow integration
@@ -39,6 +39,8 @@ class TestMidnightStrategicTiming(unittest.TestCase):
         self.mock_page.locator.return_value = MagicMock()
         self.mock_page.wait_for_function = AsyncMock()
         self.mock_page.wait_for_load_state = AsyncMock()
+        # Calendar change observer resolves immediately
+        self.mock_page.evaluate = AsyncMock(return_value=True)
         
         # Mock session object
         self.mock_session = MagicMock()
@@ -65,7 +67,7 @@ class TestMidnightStrategicTiming(unittest.TestCase):
         mock_datetime.now.return_value = mock_now
         
         # Test the function
-        result = asyncio.run(check_london_time_near_midnight())
+        result = check_london_time_near_midnight()
         
         # Assertions
         self.assertTrue(result[0], "Should detect being near midnight at 23:55")
@@ -88,7 +90,7 @@ class TestMidnightStrategicTiming(unittest.TestCase):
         mock_datetime.now.return_value = mock_now
         
         # Test the function
-        result = asyncio.run(check_london_time_near_midnight())
+        result = check_london_time_near_midnight()
         
         # Assertions
         self.assertFalse(result[0], "Should NOT detect being near midnight at 23:30")
@@ -111,7 +113,7 @@ class TestMidnightStrategicTiming(unittest.TestCase):
         mock_datetime.now.return_value = mock_now
         
         # Test the function
-        result = asyncio.run(check_london_time_near_midnight())
+        result = check_london_time_near_midnight()
         
         # Assertions - Actually, according to the logic, 00:00 IS considered "near midnight"
         self.assertTrue(result[0], "Should detect being near midnight at exactly 00:00")
@@ -121,55 +123,47 @@ class TestMidnightStrategicTiming(unittest.TestCase):
     @patch('browser_actions.get_timestamp')
     @patch('browser_actions.datetime')
     def test_wait_until_midnight_short_wait(self, mock_datetime, mock_timestamp, mock_sleep, mock_countdown):
-        """Test wait_until_midnight with a short wait (3 seconds)."""
+        """Test wait_until_midnight with a short wait (4 seconds to 00:00:01)."""
         # Mock timestamp
         mock_timestamp.return_value = "[23:59:57.00]"
         
-        # Create sequence of datetime mocks: first call returns 23:59:57, second returns 00:00:00
-        mock_first_time = MagicMock()
-        mock_first_time.hour = 23
-        mock_first_time.minute = 59
-        mock_first_time.second = 57
-        mock_first_time.replace.return_value = MagicMock()
+        # First call returns 23:59:57, the re-check after the deadline returns 00:00:01
+        london_tz = pytz.timezone('Europe/London')
+        time_23_59_57 = datetime(2025, 9, 19, 23, 59, 57).replace(tzinfo=london_tz)
+        time_00_00_01 = datetime(2025, 9, 20, 0, 0, 1).replace(tzinfo=london_tz)
+        mock_datetime.now.side_effect = [time_23_59_57, time_00_00_01]
         
-        mock_midnight_time = MagicMock()
-        mock_midnight_time.hour = 0
-        mock_midnight_time.minute = 0
-        mock_midnight_time.second = 0
-        mock_midnight_time.strftime.return_value = "00:00:00"
+        # Fake monotonic clock advanced by the mocked sleep
+        clock = [0.0]
         
-        # Create proper timedelta mock with arithmetic operations
-        from datetime import timedelta as real_timedelta
-        mock_timedelta = real_timedelta(seconds=3)
-        
-        # Mock the arithmetic operation result
-        mock_first_time.replace.return_value.__add__ = MagicMock(return_value=MagicMock())
-        mock_first_time.replace.return_value.__add__.return_value.__sub__ = MagicMock(return_value=mock_timedelta)
+        async def fake_sleep(seconds):
+            clock[0] += seconds
         
-        # Set up datetime mocking sequence
-        mock_datetime.now.side_effect = [mock_first_time, mock_midnight_time]
-        mock_datetime.timedelta = real_timedelta
-        
-        # Mock sleep and countdown to avoid actual waiting
-        mock_sleep.return_value = None
-        mock_countdown.return_value = None
+        mock_sleep.side_effect = fake_sleep
+        mock_time = MagicMock()
+        mock_time.monotonic.side_effect = lambda: clock[0]
         
         # Test the function
-        asyncio.run(wait_until_midnight())
-        
-        # Should call countdown for final seconds
-        self.assertTrue(mock_countdown.called, "Should call countdown for final seconds")
+        with patch('browser_actions.time', mock_time):
+            result = asyncio.run(wait_until_midnight())
+        
+        # Sleeps against the monotonic deadline, one wakeup per second in the last 10 seconds
+        self.assertTrue(result)
+        sleeps = [call.args[0] for call in mock_sleep.call_args_list]
+        self.assertEqual(sleeps, [1, 1, 1, 1])
+        mock_countdown.assert_not_called()
 
+    @patch('browser_actions.post_midnight_calendar_advancement')
     @patch('browser_actions.rapid_advance_to_target_week')
     @patch('browser_actions.wait_until_midnight')
     @patch('browser_actions.check_london_time_near_midnight')
     @patch('browser_actions.take_screenshot')
-    def test_find_date_strategic_timing_near_midnight(self, mock_screenshot, mock_check_midnight, mock_wait_midnight, mock_rapid_advance):
+    def test_find_date_strategic_timing_near_midnight(self, mock_screenshot, mock_check_midnight, mock_wait_midnight, mock_rapid_advance, mock_post_midnight):
         """Test find_date_on_calendar with strategic timing when near midnight."""
         # Set up: Near midnight
         mock_check_midnight.return_value = (True, "23:55")
-        mock_wait_midnight.return_value = None
-        mock_rapid_advance.return_value = True
+        mock_wait_midnight.return_value = True
+        mock_post_midnight.return_value = True
         mock_screenshot.return_value = None
         
         # Mock page interactions for 3-week advancement
@@ -190,8 +184,10 @@ class TestMidnightStrategicTiming(unittest.TestCase):
         # Assertions
         mock_check_midnight.assert_called_once()
         mock_wait_midnight.assert_called_once()
-        mock_rapid_advance.assert_called_once()
-        self.assertTrue(result, "Should return True when rapid advancement succeeds")
+        # After the midnight wait the post-midnight advancement finds the date, not rapid advancement
+        mock_post_midnight.assert_called_once()
+        mock_rapid_advance.assert_not_called()
+        self.assertTrue(result, "Should return True when post-midnight advancement succeeds")
         
         # Verify session logging
         self.assertTrue(self.mock_session.log_message.called)
@@ -229,8 +225,8 @@ class TestMidnightStrategicTiming(unittest.TestCase):
         self.assertTrue(result, "Should return True when rapid advancement succeeds")
 
     @patch('browser_actions.take_screenshot')
-    def test_strategic_timing_three_week_advancement(self, mock_screenshot):
-        """Test that strategic timing advances exactly 3 weeks."""
+    def test_strategic_timing_two_week_advancement(self, mock_screenshot):
+        """Test that strategic timing advances exactly 2 weeks (to the week before the target)."""
         mock_screenshot.return_value = None
         
         # Mock page interactions
@@ -263,24 +259,25 @@ class TestMidnightStrategicTiming(unittest.TestCase):
                     session=self.mock_session
                 ))
                 
-                # Should click Next Week exactly 3 times
-                self.assertEqual(click_count, 3, "Should click Next Week exactly 3 times")
+                # Should click Next Week exactly 2 times
+                self.assertEqual(click_count, 2, "Should click Next Week exactly 2 times")
 
     def test_integration_flow_documentation(self):
         """Document the complete strategic timing flow for verification."""
         expected_flow = [
             "1. Strategic timing enabled (is_strategic_timing=True)",
             "2. Log: 'Using strategic midnight release approach'",
-            "3. Advance exactly 3 weeks (click Next Week 3 times)",
+            "3. Advance exactly 2 weeks (click Next Week 2 times)",
             "4. Take screenshots after each advancement",
             "5. Check if within 10 minutes of midnight",
             "6a. IF near midnight: Log wait message, call wait_until_midnight()",
             "6b. IF NOT near midnight: Log immediate execution message",
-            "7. Call rapid_advance_to_target_week() to find target date"
+            "7a. IF near midnight: Call post_midnight_calendar_advancement() to find target date",
+            "7b. IF NOT near midnight: Call rapid_advance_to_target_week() to find target date"
         ]
         
         # This test serves as documentation of the expected flow
-        self.assertTrue(len(expected_flow) == 8, "Complete flow should have 8 steps")
+        self.assertTrue(len(expected_flow) == 9, "Complete flow should have 9 steps")
         print("\\n".join(expected_flow))
 
 
@@ -303,7 +300,7 @@ class TestMidnightFunctionRobustness(unittest.TestCase):
         # Mock datetime.now to return our mock
         mock_datetime.now.return_value = mock_now
         
-        result = asyncio.run(check_london_time_near_midnight())
+        result = check_london_time_near_midnight()
         
         # Should still work correctly
         self.assertTrue(result[0])
@@ -17,7 +17,13 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 # Import the functions we want to test
 from browser_actions import (
     wait_until_midnight,
-    post_midnight_calendar_advancement
+    post_midnight_calendar_advancement,
+    navigate_to_court,
+    checkout_basket,
+    _background_screenshots,
+    _CALENDAR_PROBE_JS,
+    _wait_for_calendar_change,
+    drain_screenshots
 )
 
 class TestNewMidnightFunctions(unittest.TestCase):
@@ -33,6 +39,7 @@ class TestNewMidnightFunctions(unittest.TestCase):
         self.mock_page.reload = AsyncMock()
         self.mock_page.on = MagicMock()
         self.mock_page.remove_listener = MagicMock()
+        self.mock_page.evaluate = AsyncMock(return_value=self._calendar_state())
         
         # Mock session object
         self.mock_session = MagicMock()
@@ -41,6 +48,21 @@ class TestNewMidnightFunctions(unittest.TestCase):
         # Slot details for testing
         self.slot_details = ("https://example.com/court/1", "22/09/2025", "1400")
 
+    def _calendar_state(self, target=False, next_week=False, header="MON 15/9"):
+        """Helper building the dict returned by the calendar probe script."""
+        return {"targetVisible": target, "nextWeekVisible": next_week, "firstHeader": header}
+
+    def _fake_clock(self):
+        """Helper returning (time module mock, sleep coroutine) sharing a fake monotonic clock."""
+        clock = [0.0]
+        
+        async def fake_sleep(seconds):
+            clock[0] += seconds
+        
+        mock_time = MagicMock()
+        mock_time.monotonic.side_effect = lambda: clock[0]
+        return mock_time, fake_sleep
+
     @patch('browser_actions.get_timestamp')
     @patch('browser_actions.datetime')
     @patch('browser_actions.asyncio.sleep')
@@ -56,16 +78,20 @@ class TestNewMidnightFunctions(unittest.TestCase):
         time_23_59_58 = real_datetime(2024, 1, 1, 23, 59, 58).replace(tzinfo=london_tz)
         time_00_00_01 = real_datetime(2024, 1, 2, 0, 0, 1).replace(tzinfo=london_tz)
         
-        # Mock datetime.now to return first time, then target time
+        # Mock datetime.now to return start time, then target time for the final log
         mock_datetime.now.side_effect = [time_23_59_58, time_00_00_01]
         mock_datetime.timedelta = timedelta
-        mock_sleep.return_value = None
+        mock_time, fake_sleep = self._fake_clock()
+        mock_sleep.side_effect = fake_sleep
         
         # Test the function
-        asyncio.run(wait_until_midnight())
+        with patch('browser_actions.time', mock_time):
+            result = asyncio.run(wait_until_midnight())
         
         # Should have called sleep during countdown
+        self.assertTrue(result)
         self.assertTrue(mock_sleep.called, "Should call sleep during countdown")
+        self.assertAlmostEqual(sum(call.args[0] for call in mock_sleep.call_args_list), 3.0)
         print("✅ wait_until_midnight reaches target time correctly")
 
     @patch('browser_actions.get_timestamp')
@@ -88,6 +114,58 @@ class TestNewMidnightFunctions(unittest.TestCase):
         # Should exit immediately without waiting
         print("✅ wait_until_midnight exits immediately when past target")
 
+    @patch('browser_actions.get_timestamp')
+    @patch('browser_actions.datetime')
+    @patch('browser_actions.asyncio.sleep')
+    def test_wait_until_midnight_corrects_clock_skew(self, mock_sleep, mock_datetime, mock_timestamp):
+        """Test that wait_until_midnight sleeps off any wall-clock residual after the monotonic deadline."""
+        mock_timestamp.return_value = "[23:59:58.00]"
+        
+        from datetime import datetime as real_datetime
+        london_tz = pytz.timezone('Europe/London')
+        time_23_59_58 = real_datetime(2024, 1, 1, 23, 59, 58).replace(tzinfo=london_tz)
+        # Wall clock lags the monotonic clock by half a second at the deadline
+        time_23_59_59_5 = real_datetime(2024, 1, 1, 23, 59, 59, 500000).replace(tzinfo=london_tz)
+        time_00_00_01 = real_datetime(2024, 1, 2, 0, 0, 1).replace(tzinfo=london_tz)
+        
+        mock_datetime.now.side_effect = [time_23_59_58, time_23_59_59_5, time_00_00_01]
+        mock_time, fake_sleep = self._fake_clock()
+        mock_sleep.side_effect = fake_sleep
+        
+        with patch('browser_actions.time', mock_time):
+            result = asyncio.run(wait_until_midnight())
+        
+        self.assertTrue(result)
+        sleeps = [call.args[0] for call in mock_sleep.call_args_list]
+        self.assertAlmostEqual(sleeps[-1], 1.5)
+        print("✅ wait_until_midnight corrects for clock skew")
+
+    @patch('browser_actions.get_timestamp')
+    @patch('browser_actions.datetime')
+    @patch('browser_actions.asyncio.sleep')
+    def test_wait_until_midnight_corrects_clock_skew_after_midnight(self, mock_sleep, mock_datetime, mock_timestamp):
+        """Test that the skew re-check also covers a wall clock between 00:00:00 and 00:00:01."""
+        mock_timestamp.return_value = "[23:59:58.00]"
+        
+        from datetime import datetime as real_datetime
+        london_tz = pytz.timezone('Europe/London')
+        time_23_59_58 = real_datetime(2024, 1, 1, 23, 59, 58).replace(tzinfo=london_tz)
+        # Wall clock is past midnight but still short of 00:00:01 at the deadline
+        time_00_00_00_5 = real_datetime(2024, 1, 2, 0, 0, 0, 500000).replace(tzinfo=london_tz)
+        time_00_00_01 = real_datetime(2024, 1, 2, 0, 0, 1).replace(tzinfo=london_tz)
+        
+        mock_datetime.now.side_effect = [time_23_59_58, time_00_00_00_5, time_00_00_01]
+        mock_time, fake_sleep = self._fake_clock()
+        mock_sleep.side_effect = fake_sleep
+        
+        with patch('browser_actions.time', mock_time):
+            result = asyncio.run(wait_until_midnight())
+        
+        self.assertTrue(result)
+        sleeps = [call.args[0] for call in mock_sleep.call_args_list]
+        self.assertAlmostEqual(sleeps[-1], 0.5)
+        print("✅ wait_until_midnight corrects for clock skew just after midnight")
+
     @patch('browser_actions.get_timestamp')
     @patch('browser_actions.datetime')  
     @patch('browser_actions.asyncio.sleep')
@@ -103,15 +181,18 @@ class TestNewMidnightFunctions(unittest.TestCase):
         
         mock_datetime.now.side_effect = [time_23_50_00, time_00_00_02]
         mock_datetime.timedelta = timedelta
-        
-        # Mock sleep to exit after first iteration
-        mock_sleep.return_value = None
+        mock_time, fake_sleep = self._fake_clock()
+        mock_sleep.side_effect = fake_sleep
         
         # Test the function
-        asyncio.run(wait_until_midnight())
-        
-        # Should have called sleep with 30 seconds (for >10 minute check)
-        mock_sleep.assert_called_with(30)
+        with patch('browser_actions.time', mock_time):
+            asyncio.run(wait_until_midnight())
+        
+        # Should sleep in minute steps while more than a minute remains, then finish the residual
+        sleeps = [call.args[0] for call in mock_sleep.call_args_list]
+        self.assertEqual(sleeps[0], 60)
+        self.assertEqual(len(sleeps), 11, "Should only wake once per log step")
+        self.assertAlmostEqual(sum(sleeps), 601.0)
         print("✅ wait_until_midnight uses correct logging frequency")
 
     @patch('browser_actions.take_screenshot')
@@ -129,10 +210,8 @@ class TestNewMidnightFunctions(unittest.TestCase):
         mock_datetime.now.return_value = time_00_00_02
         mock_datetime.strptime.return_value = real_datetime(2025, 9, 22)  # Monday
         
-        # Mock page locator to find the target date immediately
-        mock_locator = AsyncMock()
-        mock_locator.is_visible.return_value = True
-        self.mock_page.locator.return_value = mock_locator
+        # Calendar probe reports the target date immediately
+        self.mock_page.evaluate.return_value = self._calendar_state(target=True)
         
         # Test the function
         result = asyncio.run(post_midnight_calendar_advancement(
@@ -148,25 +227,20 @@ class TestNewMidnightFunctions(unittest.TestCase):
 
     @patch('browser_actions.take_screenshot')
     @patch('browser_actions.get_timestamp')
+    @patch('browser_actions.time')
     @patch('browser_actions.datetime')
-    def test_post_midnight_calendar_advancement_timeout(self, mock_datetime, mock_timestamp, mock_screenshot):
+    def test_post_midnight_calendar_advancement_timeout(self, mock_datetime, mock_time, mock_timestamp, mock_screenshot):
         """Test post_midnight_calendar_advancement timeout behavior."""
         mock_timestamp.return_value = "[00:00:02.00]"
         mock_screenshot.return_value = "screenshot.png"
         
-        # Mock datetime to simulate timeout
+        # Mock the monotonic clock to jump past the timeout after the first check
         from datetime import datetime as real_datetime
-        london_tz = pytz.timezone('Europe/London')
-        start_time = real_datetime(2025, 1, 1, 0, 0, 2).replace(tzinfo=london_tz)
-        timeout_time = start_time + timedelta(minutes=3)  # 3 minutes later (past 2-min timeout)
-        
-        mock_datetime.now.side_effect = [start_time, timeout_time]
+        mock_time.monotonic.side_effect = [0.0, 180.0]  # deadline computed, then 3 minutes later
         mock_datetime.strptime.return_value = real_datetime(2025, 9, 22)
         
-        # Mock page locator to never find the date
-        mock_locator = AsyncMock()
-        mock_locator.is_visible.return_value = False
-        self.mock_page.locator.return_value = mock_locator
+        # Calendar probe never finds the date
+        self.mock_page.evaluate.return_value = self._calendar_state(next_week=True)
         
         # Test the function
         result = asyncio.run(post_midnight_calendar_advancement(
@@ -194,9 +268,17 @@ class TestNewMidnightFunctions(unittest.TestCase):
         mock_date_locator = AsyncMock()
         mock_next_week_locator = AsyncMock()
         
-        # First call: date not visible, second call: date found after clicking
-        mock_date_locator.is_visible.side_effect = [False, True]
-        mock_next_week_locator.is_visible.return_value = True
+        # First probe: date not visible, second probe: date found after clicking;
+        # the calendar-change observer in between reports the header changed
+        states = iter([
+            self._calendar_state(next_week=True, header="MON 8/9"),
+            self._calendar_state(target=True, next_week=True),
+        ])
+        
+        async def evaluate(script, arg=None):
+            return next(states) if script == _CALENDAR_PROBE_JS else True
+        
+        self.mock_page.evaluate.side_effect = evaluate
         mock_next_week_locator.click = AsyncMock()
         
         # Mock locator to return different objects based on selector
@@ -224,7 +306,7 @@ class TestNewMidnightFunctions(unittest.TestCase):
     @patch('browser_actions.get_timestamp')
     @patch('browser_actions.datetime')
     def test_post_midnight_calendar_advancement_dialog_handling(self, mock_datetime, mock_timestamp, mock_screenshot):
-        """Test that post_midnight_calendar_advancement sets up dialog handling."""
+        """Test that post_midnight_calendar_advancement relies on the page-level dialog handler."""
         mock_timestamp.return_value = "[00:00:02.00]"
         mock_screenshot.return_value = "screenshot.png"
         
@@ -232,23 +314,128 @@ class TestNewMidnightFunctions(unittest.TestCase):
         mock_datetime.now.return_value = self._create_mock_time(0, 0, 2)
         mock_datetime.strptime.return_value = datetime(2025, 9, 22)
         
-        # Mock page locator to find date immediately (to exit quickly)
-        mock_locator = AsyncMock()
-        mock_locator.is_visible.return_value = True
-        self.mock_page.locator.return_value = mock_locator
+        # Calendar probe finds the date immediately (to exit quickly)
+        self.mock_page.evaluate.return_value = self._calendar_state(target=True)
         
         # Test the function
         result = asyncio.run(post_midnight_calendar_advancement(
             self.mock_page, "22/09/2025", self.slot_details, self.mock_session
         ))
         
-        # Should have set up dialog handler
-        self.mock_page.on.assert_called_with("dialog", unittest.mock.ANY)
+        # Dialogs are handled by the listener installed in navigate_to_court
+        self.mock_page.on.assert_not_called()
+        self.mock_page.remove_listener.assert_not_called()
+        
+        print("✅ post_midnight_calendar_advancement leaves dialog handling to the page")
+
+    @patch('browser_actions.take_screenshot')
+    @patch('browser_actions.get_timestamp')
+    def test_navigate_to_court_installs_dialog_handler_once(self, mock_timestamp, mock_screenshot):
+        """Test that navigate_to_court registers the shared dialog handler only once per page."""
+        mock_timestamp.return_value = "[23:55:00.00]"
+        mock_screenshot.return_value = "screenshot.png"
+        
+        self.mock_page.goto = AsyncMock()
+        self.mock_page.title = AsyncMock(return_value="Court 1")
+        self.mock_page.locator.return_value = AsyncMock()
+        
+        for _ in range(2):
+            result = asyncio.run(navigate_to_court(
+                self.mock_page, "https://example.com/court/1/", self.mock_session
+            ))
+            self.assertTrue(result)
+        
+        self.mock_page.on.assert_called_once()
+        event, handler = self.mock_page.on.call_args[0]
+        self.assertEqual(event, "dialog")
+        
+        # The handler accepts the dialog and logs through the session
+        mock_dialog = MagicMock()
+        mock_dialog.message = "Confirm form resubmission"
+        mock_dialog.accept = AsyncMock()
+        asyncio.run(handler(mock_dialog))
+        mock_dialog.accept.assert_awaited_once()
+        self.mock_session.log_message.assert_any_call(
+            "[23:55:00.00] 🔄 Dialog detected and accepted: Confirm form resubmission"
+        )
+        print("✅ navigate_to_court installs the dialog handler once")
+
+    @patch('browser_actions._first_visible')
+    @patch('browser_actions.take_screenshot')
+    @patch('browser_actions.get_timestamp')
+    def test_checkout_dialog_accepted_by_page_handler(self, mock_timestamp, mock_screenshot, mock_first_visible):
+        """Test that a dialog raised during checkout is accepted by the handler installed in navigate_to_court."""
+        mock_timestamp.return_value = "[00:00:05.00]"
+        mock_screenshot.return_value = "screenshot.png"
+        mock_first_visible.return_value = "success"
+        
+        self.mock_page.goto = AsyncMock()
+        self.mock_page.title = AsyncMock(return_value="Court 1")
+        self.mock_page.locator.return_value = AsyncMock()
+        
+        mock_dialog = MagicMock()
+        mock_dialog.message = "Are you sure you want to make this booking?"
+        mock_dialog.accept = AsyncMock()
+        
+        async def run():
+            await navigate_to_court(self.mock_page, "https://example.com/court/1/", self.mock_session)
+            _, handler = self.mock_page.on.call_args[0]
+            
+            # The site raises a confirm when Make Booking is clicked
+            async def click_with_dialog():
+                await handler(mock_dialog)
+            
+            self.mock_page.locator.return_value.click.side_effect = click_with_dialog
+            return await checkout_basket(self.mock_page, "https://example.com/basket/", session=self.mock_session)
+        
+        self.assertTrue(asyncio.run(run()))
+        mock_dialog.accept.assert_awaited_once()
+        self.mock_session.log_message.assert_any_call(
+            "[00:00:05.00] 🔄 Dialog detected and accepted: Are you sure you want to make this booking?"
+        )
+        print("✅ checkout dialogs are accepted by the page-level handler")
+
+    @patch('browser_actions.get_timestamp')
+    def test_post_midnight_calendar_advancement_does_not_wait_for_screenshot(self, mock_timestamp):
+        """Test that the date-found screenshot runs in the background."""
+        mock_timestamp.return_value = "[00:00:02.00]"
+        self.mock_page.evaluate.return_value = self._calendar_state(target=True)
+
+        async def run():
+            release = asyncio.Event()
+
+            async def slow_screenshot(*args, **kwargs):
+                await release.wait()
+                return "screenshot.png"
+
+            with patch('browser_actions.take_screenshot', side_effect=slow_screenshot) as mock_screenshot:
+                result = await post_midnight_calendar_advancement(
+                    self.mock_page, "22/09/2025", self.slot_details, self.mock_session
+                )
+                pending = set(_background_screenshots)
+                release.set()
+                await drain_screenshots()
+            return result, pending, mock_screenshot
+
+        result, pending, mock_screenshot = asyncio.run(run())
+
+        self.assertTrue(result)
+        self.assertEqual(len(pending), 1)
+        self.assertEqual(mock_screenshot.call_args.args[1], "date_found_optimised")
+        self.assertFalse(_background_screenshots)
+        print("✅ post_midnight_calendar_advancement does not wait for its screenshot")
+
+    def test_wait_for_calendar_change_falls_back_after_postback(self):
+        """Test that a torn-down observer falls back to polling the new document."""
+        from playwright.async_api import Error as PlaywrightError
+        self.mock_page.evaluate.side_effect = PlaywrightError("Execution context was destroyed")
         
-        # Should have removed dialog handler
-        self.mock_page.remove_listener.assert_called_with("dialog", unittest.mock.ANY)
+        changed = asyncio.run(_wait_for_calendar_change(self.mock_page, "MON 8/9", timeout=3000))
         
-        print("✅ post_midnight_calendar_advancement sets up dialog handling")
+        self.assertTrue(changed)
+        self.mock_page.wait_for_function.assert_awaited_once()
+        self.assertEqual(self.mock_page.wait_for_function.call_args.kwargs["arg"], "MON 8/9")
+        print("✅ _wait_for_calendar_change falls back to polling after a postback")
 
     def _create_mock_time(self, hour, minute, second):
         """Helper method to create a mock datetime with specific time."""
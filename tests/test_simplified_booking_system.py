@@ -57,6 +57,52 @@ class TestSheetsManager:
             assert assignments[1]['Account'] == 'Father'
             assert assignments[1]['Time'] == '1500'
 
+    def test_write_booking_logs_single_insert(self):
+        """Test that several log entries are written with one insert, newest on top."""
+        with patch.object(SheetsManager, '_connect'):
+            sheets_manager = SheetsManager("test_sheet_id", '{"test": "credentials"}')
+        worksheet = Mock()
+        sheets_manager.spreadsheet = Mock()
+        sheets_manager.spreadsheet.worksheet.return_value = worksheet
+
+        entries = [
+            sheets_manager.create_log_entry('mother@example.com', 'Court 1', '13/01/2024', slot, '✅ Success')
+            for slot in ('1400', '1500')
+        ]
+        sheets_manager.write_booking_logs(entries)
+
+        worksheet.insert_rows.assert_called_once()
+        rows, index = worksheet.insert_rows.call_args.args
+        assert index == 2
+        assert [row[4] for row in rows] == ['1500', '1400']
+
+    def test_read_worksheet_uses_single_values_request(self, capsys):
+        """Test that worksheets are read with one values.get call and padded like get_all_values."""
+        from gspread.exceptions import APIError, WorksheetNotFound
+
+        with patch.object(SheetsManager, '_connect'):
+            sheets_manager = SheetsManager("test_sheet_id", '{"test": "credentials"}')
+        sheets_manager.spreadsheet = Mock()
+        sheets_manager.spreadsheet.values_get.return_value = {
+            'values': [['Account', 'Time', 'Notes'], ['Mother', '1400'], []]
+        }
+
+        assignments = sheets_manager.read_booking_assignments()
+
+        sheets_manager.spreadsheet.worksheet.assert_not_called()
+        sheets_manager.spreadsheet.values_get.assert_called_once_with("'BookingSchedule'")
+        assert assignments == [{'Account': 'Mother', 'Time': '1400', 'Notes': ''}]
+
+        error_response = Mock()
+        error_response.json.return_value = {
+            'error': {'code': 400, 'message': "Unable to parse range: 'Missing'", 'status': 'INVALID_ARGUMENT'}
+        }
+        sheets_manager.spreadsheet.values_get.side_effect = APIError(error_response)
+        with pytest.raises(WorksheetNotFound):
+            sheets_manager._get_all_values("Missing")
+        # A missing tab is an expected condition, not a non-retryable API error
+        assert "Non-retryable API error" not in capsys.readouterr().out
+
 
 class TestMultiSessionManager:
     """Test the updated MultiSessionManager functionality."""
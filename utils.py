@@ -1,22 +1,54 @@
 # utils.py
 # Centralized utility functions for the tennis court booking system
 
+import time
 import pytz
 from datetime import datetime
 
+# London timezone, resolved once at import instead of on every call
+LONDON_TZ = pytz.timezone('Europe/London')
+
+# Last whole second formatted by get_timestamp() and its "HH:MM:SS" string
+_last_timestamp_second = None
+_last_timestamp_prefix = ""
+
 def get_timestamp():
-    """Returns a timestamp string with 100ths of seconds in London UK timezone."""
-    uk_tz = pytz.timezone('Europe/London')
-    london_time = datetime.now(uk_tz)
-    return f"[{london_time.strftime('%H:%M:%S.%f')[:-4]}]"
+    """Returns a timestamp string with 100ths of seconds in London UK timezone.
+
+    The "HH:MM:SS" part is only re-formatted when the second changes; calls within
+    the same second just append the hundredths.
+    """
+    global _last_timestamp_second, _last_timestamp_prefix
+    now = time.time()
+    second = int(now)
+    if second != _last_timestamp_second:
+        _last_timestamp_prefix = datetime.fromtimestamp(second, LONDON_TZ).strftime('%H:%M:%S')
+        _last_timestamp_second = second
+    return f"[{_last_timestamp_prefix}.{int((now - second) * 100):02d}]"
+
+# Same idea for get_log_timestamp(): last whole second and its "YYYY-MM-DD HH:MM:SS" string
+_last_log_second = None
+_last_log_prefix = ""
+
+def get_log_timestamp():
+    """Returns a "YYYY-MM-DD HH:MM:SS.mmm" London timestamp for session log entries.
+
+    Like get_timestamp(), the date and time part is only re-formatted when the second
+    changes.
+    """
+    global _last_log_second, _last_log_prefix
+    now = time.time()
+    second = int(now)
+    if second != _last_log_second:
+        _last_log_prefix = datetime.fromtimestamp(second, LONDON_TZ).strftime('%Y-%m-%d %H:%M:%S')
+        _last_log_second = second
+    return f"{_last_log_prefix}.{int((now - second) * 1000):03d}"
 
 def get_current_london_time():
     """Get current time in London timezone as formatted string."""
-    uk_tz = pytz.timezone('Europe/London')
-    london_time = datetime.now(uk_tz)
+    london_time = datetime.now(LONDON_TZ)
     return london_time.strftime('%Y-%m-%d %H:%M:%S')
 
 def get_london_datetime():
     """Get current datetime object in London timezone."""
-    uk_tz = pytz.timezone('Europe/London')
-    return datetime.now(uk_tz)
+    return datetime.now(LONDON_TZ)